@@ -5,12 +5,19 @@ Includes:
 - containers_quick_reference: brief descriptions
 - container_examples: small sanity examples
 - BIG_O_NOTES: cheat sheet (see Day1/THEORY.md for deeper theory: asymptotics, internals, and trade-offs)
-- bench_container_ops: micro-benchmarks for membership and insert patterns
+- BENCHMARK_COMPLEXITY: expected scaling of each benchmark case, derived from BIG_O_NOTES
+- benchmark_cases / bench_container_ops: micro-benchmarks for membership and insert patterns
+- IntVector / IntSet / IntBitmap: compact unboxed integer containers (array.array
+  storage, zero-copy memoryview / numpy export) and container_memory to compare
+  their footprint with list/set
 """
 
 from __future__ import annotations
-from typing import Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Union
+from array import array
+from bisect import bisect_left
 import random
+import sys
 import time
 
 
@@ -25,7 +32,12 @@ def containers_quick_reference() -> Dict[str, str]:
 
 # Big-O cheat notes
 BIG_O_NOTES = {
-    "Access": {"list[i]": "O(1)", "dict[key]": "O(1) avg", "set membership": "O(1) avg"},
+    "Access": {
+        "list[i]": "O(1)",
+        "dict[key]": "O(1) avg",
+        "list membership": "O(n)",
+        "set membership": "O(1) avg",
+    },
     "Insert/Delete": {
         "list append/pop end": "O(1) amortized",
         "list insert/pop middle": "O(n)",
@@ -35,6 +47,18 @@ BIG_O_NOTES = {
     "Traversal": {"list/dict/set iteration": "O(n)"},
 }
 
+# Which BIG_O_NOTES entry each benchmark case exercises. A case performs ~n of
+# those operations, so its expected total cost is n times the per-op claim.
+# 05-benchmarks.py --fit measures the scaling and flags disagreements.
+_CASE_NOTES = {
+    "list_membership": ("Access", "list membership"),
+    "set_membership": ("Access", "set membership"),
+    "list_append_end": ("Insert/Delete", "list append/pop end"),
+    "list_insert_front": ("Insert/Delete", "list insert/pop middle"),
+}
+_TIMES_N = {"O(1)": "O(n)", "O(1) avg": "O(n)", "O(1) amortized": "O(n)", "O(n)": "O(n^2)"}
+BENCHMARK_COMPLEXITY = {case: _TIMES_N[BIG_O_NOTES[sec][op]] for case, (sec, op) in _CASE_NOTES.items()}
+
 
 def container_examples() -> None:
     # list
@@ -56,55 +80,277 @@ def container_examples() -> None:
     assert a_sorted == [1, 1, 3, 4, 5, 9]
 
 
-def bench_container_ops(n: int = 20000, trials: int = 3) -> Dict[str, float]:
-    """Micro-benchmarks to visualize typical complexity trade-offs.
+class IntVector:
+    """List-like vector of machine integers stored unboxed in an array.array.
 
-    - list membership vs set membership
-    - list append vs insert(0)
+    A list of ints costs an 8-byte pointer plus a ~28-byte int object per
+    element; here each element is itemsize bytes (8 for the default 'q').
+    append/extend are amortized O(1) like list; slicing returns a copy (like
+    list); view() returns a zero-copy memoryview and to_numpy() a zero-copy
+    ndarray over the same buffer (numpy optional).
+    """
 
-    Keep n small for quick runs. Returns average seconds per trial.
+    __slots__ = ("_data",)
+
+    def __init__(self, values: Iterable[int] = (), typecode: str = "q") -> None:
+        if len(typecode) != 1 or typecode not in "bBhHiIlLqQ":
+            raise ValueError(f"integer typecode required, got {typecode!r}")
+        self._data = array(typecode)
+        self.extend(values)
+
+    @property
+    def typecode(self) -> str:
+        return self._data.typecode
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def append(self, x: int) -> None:
+        self._data.append(x)
+
+    def extend(self, values: Iterable[int]) -> None:
+        if isinstance(values, IntVector):
+            values = values._data
+        if isinstance(values, array) and values.typecode != self._data.typecode:
+            # array.extend only accepts the same typecode; convert (range-checked)
+            self._data.fromlist(values.tolist())
+        else:
+            # an array with the same typecode is copied as raw memory, no boxing
+            self._data.extend(values)
+
+    def pop(self, i: int = -1) -> int:
+        return self._data.pop(i)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            out = IntVector(typecode=self._data.typecode)
+            out._data = self._data[idx]
+            return out
+        return self._data[idx]
+
+    def __setitem__(self, idx: int, value: int) -> None:
+        self._data[idx] = value
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IntVector):
+            return self._data.tolist() == other._data.tolist()
+        if isinstance(other, list):
+            return self._data.tolist() == other
+        return NotImplemented
+
+    def view(self) -> memoryview:
+        """Zero-copy buffer view; invalidated (and blocks resizing) while held."""
+        return memoryview(self._data)
+
+    def to_numpy(self):
+        """Zero-copy numpy view of the current contents (numpy required)."""
+        try:
+            import numpy as np  # type: ignore
+        except Exception:
+            raise ImportError("numpy is required for IntVector.to_numpy")
+        return np.frombuffer(self._data, dtype=self._data.typecode)
+
+    def tolist(self) -> List[int]:
+        return self._data.tolist()
+
+    def __repr__(self) -> str:
+        return f"IntVector({self._data.tolist()!r}, typecode={self._data.typecode!r})"
+
+
+class IntSet:
+    """Set of ints kept as a sorted, unique array.array.
+
+    Membership is a binary search (O(log n)); add/discard shift the array
+    (O(n) memmove, fast in practice); bulk construction sorts once. Uses
+    itemsize bytes per element versus ~60+ bytes per element for a set of ints.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, values: Iterable[int] = (), typecode: str = "q") -> None:
+        self._data = array(typecode, sorted(set(values)))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def __contains__(self, x: int) -> bool:
+        i = bisect_left(self._data, x)
+        return i < len(self._data) and self._data[i] == x
+
+    def add(self, x: int) -> None:
+        i = bisect_left(self._data, x)
+        if i == len(self._data) or self._data[i] != x:
+            self._data.insert(i, x)
+
+    def discard(self, x: int) -> None:
+        i = bisect_left(self._data, x)
+        if i < len(self._data) and self._data[i] == x:
+            del self._data[i]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def view(self) -> memoryview:
+        return memoryview(self._data)
+
+
+class IntBitmap:
+    """Set of ints in [0, universe) as one bit each; best for dense ids.
+
+    O(1) add/discard/membership and universe / 8 bytes regardless of how many
+    values are present.
+    """
+
+    __slots__ = ("_bits", "universe", "_len")
+
+    def __init__(self, universe: int, values: Iterable[int] = ()) -> None:
+        if universe < 0:
+            raise ValueError("universe must be >= 0")
+        self.universe = universe
+        self._bits = bytearray((universe + 7) // 8)
+        self._len = 0
+        for v in values:
+            self.add(v)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def _check(self, x: int) -> None:
+        if not 0 <= x < self.universe:
+            raise ValueError(f"{x} outside [0, {self.universe})")
+
+    def __contains__(self, x: int) -> bool:
+        return 0 <= x < self.universe and bool(self._bits[x >> 3] & (1 << (x & 7)))
+
+    def add(self, x: int) -> None:
+        self._check(x)
+        if not self._bits[x >> 3] & (1 << (x & 7)):
+            self._bits[x >> 3] |= 1 << (x & 7)
+            self._len += 1
+
+    def discard(self, x: int) -> None:
+        if x in self:
+            self._bits[x >> 3] &= ~(1 << (x & 7)) & 0xFF
+            self._len -= 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        for byte_i, byte in enumerate(self._bits):
+            while byte:
+                low = byte & -byte
+                yield (byte_i << 3) + low.bit_length() - 1
+                byte ^= low
+
+
+def _deep_int_container_bytes(c: Any) -> int:
+    """sys.getsizeof of the container plus each distinct int object it holds."""
+    seen = set()
+    total = sys.getsizeof(c)
+    for x in c:
+        if id(x) not in seen:
+            seen.add(id(x))
+            total += sys.getsizeof(x)
+    return total
+
+
+def container_memory(n: int = 100_000) -> Dict[str, int]:
+    """Approximate bytes for n distinct ints in each container (boxed ints included)."""
+    values = list(range(1_000, 1_000 + n))  # > 256, so no small-int caching
+    return {
+        "list": _deep_int_container_bytes(values),
+        "IntVector": sys.getsizeof(IntVector(values)._data),
+        "set": _deep_int_container_bytes(set(values)),
+        "IntSet": sys.getsizeof(IntSet(values)._data),
+        "IntBitmap": sys.getsizeof(IntBitmap(1_000 + n, values)._bits),
+    }
+
+
+def benchmark_cases(n: int = 20000) -> Dict[str, Callable[[], Any]]:
+    """Zero-arg callables for each container operation at size n.
+
+    Setup (base list, probes, set) happens here, outside the timed calls.
+    Discovered and run by Day1/05-benchmarks.py (warmup, trials, stats, memory).
     """
     rng = random.Random(0)
     base = list(range(n))
     probe = [rng.randrange(n) for _ in range(n // 5)]
+    s = set(base)
+    iv = IntVector(base)
+    iset = IntSet(base)
+    bitmap = IntBitmap(n, base)
 
-    timings: Dict[str, float] = {}
+    def list_membership() -> int:
+        return sum(1 for x in probe if x in base)
 
-    # list membership
-    start = time.perf_counter()
-    for _ in range(trials):
-        count = 0
-        for x in probe:
-            if x in base:
-                count += 1
-    timings["list_membership"] = (time.perf_counter() - start) / trials
+    def set_membership() -> int:
+        return sum(1 for x in probe if x in s)
 
-    # set membership
-    s = set(base)
-    start = time.perf_counter()
-    for _ in range(trials):
-        count = 0
-        for x in probe:
-            if x in s:
-                count += 1
-    timings["set_membership"] = (time.perf_counter() - start) / trials
-
-    # append at end
-    start = time.perf_counter()
-    for _ in range(trials):
-        arr = []
+    def intset_membership() -> int:
+        return sum(1 for x in probe if x in iset)
+
+    def bitmap_membership() -> int:
+        return sum(1 for x in probe if x in bitmap)
+
+    def list_append_end() -> List[int]:
+        arr: List[int] = []
         for x in base:
             arr.append(x)
-    timings["list_append_end"] = (time.perf_counter() - start) / trials
+        return arr
 
-    # insert at front (slow)
-    start = time.perf_counter()
-    for _ in range(trials):
-        arr = []
+    def intvector_append_end() -> IntVector:
+        vec = IntVector()
+        for x in base:
+            vec.append(x)
+        return vec
+
+    def list_insert_front() -> List[int]:
+        arr: List[int] = []
         for x in base:
             arr.insert(0, x)
-    timings["list_insert_front"] = (time.perf_counter() - start) / trials
+        return arr
+
+    return {
+        "list_membership": list_membership,
+        "set_membership": set_membership,
+        "intset_membership": intset_membership,
+        "bitmap_membership": bitmap_membership,
+        "list_append_end": list_append_end,
+        "intvector_append_end": intvector_append_end,
+        "intvector_extend": lambda: IntVector(iv),
+        "list_extend": lambda: list(base),
+        "list_insert_front": list_insert_front,
+    }
 
+
+def bench_container_ops(n: int = 20000, trials: int = 3) -> Dict[str, float]:
+    """Micro-benchmarks to visualize typical complexity trade-offs.
+
+    - list membership vs set membership (and compact IntSet / IntBitmap)
+    - list append vs insert(0) (and IntVector append / bulk extend)
+
+    Keep n small for quick runs. Returns average seconds per trial.
+    For warmup, medians/p95, GC control and memory use Day1/05-benchmarks.py.
+    """
+    timings: Dict[str, float] = {}
+    for name, fn in benchmark_cases(n).items():
+        start = time.perf_counter()
+        for _ in range(trials):
+            fn()
+        timings[name] = (time.perf_counter() - start) / trials
     return timings
 
 
@@ -114,3 +360,11 @@ if __name__ == "__main__":
     print("Containers benchmarks (avg seconds):")
     for k in sorted(times):
         print(f"  {k:20s} : {times[k]:.6f}")
+
+    vec = IntVector([1, 2, 3])
+    vec.extend([4, 5])
+    assert vec[1:3] == [2, 3] and vec.view()[4] == 5
+    assert 3 in IntSet([5, 3, 3]) and 4 not in IntSet([5, 3]) and list(IntBitmap(10, [7, 2])) == [2, 7]
+    print("Containers memory for 100k ints (bytes):")
+    for k, v in container_memory(100_000).items():
+        print(f"  {k:20s} : {v:,d}")
@@ -3,12 +3,23 @@
 
 See Day1/THEORY.md for deeper notes on when to use each, algorithmic complexities,
 and how heaps compare to full sorts for top-k selection.
+
+SlidingWindow generalizes sliding_window_max: one O(n) pass over an arbitrarily
+long iterator (or chunked arrays) yielding max/min/sum/mean/var per window.
+sliding_window_max_numpy / sliding_window_min_numpy are vectorized van Herk /
+Gil-Werman versions for large numeric arrays (numpy optional; falls back to the
+deque loop when missing).
+RecordArray is a columnar alternative to namedtuple for millions of records:
+typed array.array columns plus a __slots__ row proxy for attribute access.
 """
 
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from array import array
 from collections import Counter, defaultdict, deque, namedtuple, OrderedDict
+from dataclasses import dataclass
 import heapq
+import sys
 
 
 def collections_examples() -> Dict[str, Any]:
@@ -86,6 +97,386 @@ def sliding_window_max(nums: list[int], k: int) -> list[int]:
     return out
 
 
+def sliding_window_min(nums: list[int], k: int) -> list[int]:
+    """Min counterpart of sliding_window_max (increasing deque of indices)."""
+    if k <= 0 or not nums or k > len(nums):
+        return []
+    q = deque()
+    out: list[int] = []
+    for i, x in enumerate(nums):
+        while q and q[0] <= i - k:
+            q.popleft()
+        while q and nums[q[-1]] >= x:
+            q.pop()
+        q.append(i)
+        if i >= k - 1:
+            out.append(nums[q[0]])
+    return out
+
+
+def _van_herk(arr, k: int, op, pad_value):
+    """Window reduction with 3 comparisons/element, independent of k.
+
+    Split into blocks of k; g = running op from each block start (prefix),
+    h = running op towards each block end (suffix). The window [i, i+k-1]
+    spans at most two blocks, so its result is op(h[i], g[i + k - 1]).
+    """
+    import numpy as np  # type: ignore
+
+    n = arr.shape[0]
+    m = -(-n // k)  # ceil(n / k) blocks
+    padded = np.full(m * k, pad_value, dtype=arr.dtype)
+    padded[:n] = arr
+    blocks = padded.reshape(m, k)
+    g = op.accumulate(blocks, axis=1).reshape(-1)
+    h = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+    return op(h[: n - k + 1], g[k - 1 : n])
+
+
+def _sliding_window_numpy(nums, k: int, is_max: bool):
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return sliding_window_max(list(nums), k) if is_max else sliding_window_min(list(nums), k)
+
+    arr = np.asarray(nums)
+    if arr.ndim != 1:
+        raise ValueError("nums must be 1-D")
+    if arr.dtype.kind == "b":
+        arr = arr.astype(np.uint8)
+    if arr.dtype.kind not in "iuf":
+        # objects / big Python ints: keep exact semantics via the deque loop
+        out = sliding_window_max(list(nums), k) if is_max else sliding_window_min(list(nums), k)
+        return np.asarray(out, dtype=arr.dtype)
+    if k <= 0 or arr.size == 0 or k > arr.size:
+        return np.empty(0, dtype=arr.dtype)
+    if arr.dtype.kind == "f":
+        pad = -np.inf if is_max else np.inf
+    else:
+        info = np.iinfo(arr.dtype)
+        pad = info.min if is_max else info.max
+    nan = np.isnan(arr) if arr.dtype.kind == "f" else None
+    if nan is None or not nan.any():
+        return _van_herk(arr, k, np.maximum if is_max else np.minimum, pad)
+    # the block scans would smear a NaN over its whole block (and the windows
+    # sharing it), so reduce without NaNs and mark only windows that hold one
+    out = _van_herk(np.where(nan, pad, arr), k, np.maximum if is_max else np.minimum, pad)
+    counts = np.concatenate(([0], np.cumsum(nan)))
+    out[counts[k:] - counts[:-k] > 0] = np.nan
+    return out
+
+
+def sliding_window_max_numpy(nums, k: int):
+    """Vectorized sliding_window_max returning an ndarray (same values, same edge cases).
+
+    O(n) with ~3 numpy passes instead of a Python-level deque step per element.
+    Returns the list from sliding_window_max when numpy is missing.
+    NaN: a window containing NaN yields NaN (like np.max over that window) and
+    other windows are unaffected. The deque loops (and SlidingWindow) agree on
+    NaN-free windows, but for a window holding NaN their result depends on
+    where the NaN sits, since every comparison with it is False.
+    """
+    return _sliding_window_numpy(nums, k, is_max=True)
+
+
+def sliding_window_min_numpy(nums, k: int):
+    """Vectorized sliding_window_min; see sliding_window_max_numpy."""
+    return _sliding_window_numpy(nums, k, is_max=False)
+
+
+def _merge_moments(a: Tuple[int, float, float, float], b: Tuple[int, float, float, float]) -> Tuple[int, float, float, float]:
+    """Chan et al. pairwise merge of (count, sum, mean, M2) summaries; no subtraction of M2."""
+    na, sa, ma, m2a = a
+    nb, sb, mb, m2b = b
+    if na == 0:
+        return b
+    if nb == 0:
+        return a
+    n = na + nb
+    delta = mb - ma
+    return n, sa + sb, ma + delta * nb / n, m2a + m2b + delta * delta * na * nb / n
+
+
+_NO_MOMENTS: Tuple[int, float, float, float] = (0, 0.0, 0.0, 0.0)
+
+
+class SlidingWindow:
+    """Streaming count-based window of size k with several statistics at once.
+
+    - max/min: monotonic deques of (index, value), as in sliding_window_max
+    - sum/mean/var: two-stack aggregation of (count, sum, mean, M2) summaries
+      combined with Chan's merge formula. New values are merged into the back
+      summary; when the oldest value must leave and the front stack is empty,
+      the back values are moved over as suffix summaries (newest to oldest),
+      so eviction is a pop and no value is ever subtracted out. A 1e9 spike
+      therefore stops affecting the statistics the moment it leaves.
+    Each push is O(1) amortized and memory is O(k); results are produced as
+    soon as the first window is full, so the stream is never materialized.
+    """
+
+    STATS = ("max", "min", "sum", "mean", "var")
+
+    def __init__(self, k: int, stats: Sequence[str] = STATS, ddof: int = 0) -> None:
+        if k <= 0:
+            raise ValueError("k must be positive")
+        unknown = set(stats) - set(self.STATS)
+        if unknown:
+            raise ValueError(f"unknown stats: {sorted(unknown)}")
+        if ddof >= k:
+            raise ValueError("ddof must be smaller than k")
+        self.k = k
+        self.stats = tuple(stats)
+        self.ddof = ddof
+        self._i = 0
+        self._maxq: deque = deque()  # (index, value), values decreasing
+        self._minq: deque = deque()  # (index, value), values increasing
+        self._front: List[Tuple[int, float, float, float]] = []  # suffix summaries, oldest on top
+        self._back: List[float] = []  # raw values newer than the front stack
+        self._back_moments = _NO_MOMENTS
+
+    def push(self, x: float) -> Optional[Dict[str, float]]:
+        """Add one value; return the stats for the current window once it is full."""
+        i = self._i
+        self._i += 1
+
+        while self._maxq and self._maxq[-1][1] <= x:
+            self._maxq.pop()
+        self._maxq.append((i, x))
+        while self._minq and self._minq[-1][1] >= x:
+            self._minq.pop()
+        self._minq.append((i, x))
+        if self._maxq[0][0] <= i - self.k:
+            self._maxq.popleft()
+        if self._minq[0][0] <= i - self.k:
+            self._minq.popleft()
+
+        self._back.append(x)
+        self._back_moments = _merge_moments(self._back_moments, (1, x, x, 0.0))
+        if len(self._front) + len(self._back) > self.k:
+            if not self._front:  # O(k) every k evictions: O(1) amortized
+                acc = _NO_MOMENTS
+                for v in reversed(self._back):
+                    acc = _merge_moments((1, v, v, 0.0), acc)
+                    self._front.append(acc)
+                self._back.clear()
+                self._back_moments = _NO_MOMENTS
+            self._front.pop()
+        n, total, mean, m2 = _merge_moments(self._front[-1] if self._front else _NO_MOMENTS, self._back_moments)
+
+        if n < self.k:
+            return None
+        out: Dict[str, float] = {}
+        for name in self.stats:
+            if name == "max":
+                out[name] = self._maxq[0][1]
+            elif name == "min":
+                out[name] = self._minq[0][1]
+            elif name == "sum":
+                out[name] = total
+            elif name == "mean":
+                out[name] = mean
+            else:
+                out[name] = m2 / (n - self.ddof)
+        return out
+
+    def feed(self, values: Iterable[float]) -> Iterator[Dict[str, float]]:
+        """Lazily yield one stats dict per full window over `values`."""
+        for x in values:
+            out = self.push(x)
+            if out is not None:
+                yield out
+
+    def feed_chunks(self, chunks: Iterable[Iterable[float]]) -> Iterator[Dict[str, float]]:
+        """Like feed, for a stream of chunks (lists, arrays); windows span chunk edges."""
+        for chunk in chunks:
+            yield from self.feed(chunk.tolist() if hasattr(chunk, "tolist") else chunk)
+
+
+class _RowProxy:
+    """Base for generated row views: (columns, index), no per-record payload."""
+
+    __slots__ = ("_cols", "_i")
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, cols: List[array], i: int) -> None:
+        self._cols = cols
+        self._i = i
+
+    def astuple(self) -> Tuple[Any, ...]:
+        return tuple(col[self._i] for col in self._cols)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.astuple())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _RowProxy):
+            return self.astuple() == other.astuple()
+        if isinstance(other, tuple):
+            return self.astuple() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{f}={v!r}" for f, v in zip(self._fields, self.astuple()))
+        return f"{type(self).__name__}({body})"
+
+
+def _column_property(c: int) -> property:
+    def get(self):
+        return self._cols[c][self._i]
+
+    def set(self, value):
+        self._cols[c][self._i] = value
+
+    return property(get, set)
+
+
+class RecordArray:
+    """Structure-of-arrays record store: one typed array.array per field.
+
+    RecordArray("Point", {"x": "d", "y": "d"}) stores n points in 16 * n bytes
+    of column data, versus ~100+ bytes per namedtuple (object header, tuple
+    slots and two boxed floats). Indexing returns a lightweight __slots__ row
+    proxy (generated per record type) whose attributes read/write the columns.
+    Proxies are created on access, so per-row attribute loops are slower than
+    namedtuple; bulk work should go through the columns.
+
+    - from_rows / extend: batch construction from iterables of tuples
+    - column(name): the raw array (buffer protocol), to_numpy_columns(): zero-copy
+      ndarray views for vectorized ops (numpy optional)
+    - to_structured(): numpy structured array; AoS layout, so this is one copy
+    """
+
+    def __init__(self, name: str, fields: Dict[str, str]) -> None:
+        if not fields:
+            raise ValueError("at least one field required")
+        self.name = name
+        self.fields = tuple(fields)
+        self._cols: List[array] = [array(tc) for tc in fields.values()]
+        ns: Dict[str, Any] = {"__slots__": (), "_fields": self.fields}
+        for c, f in enumerate(self.fields):
+            ns[f] = _column_property(c)
+        self._row_type = type(name, (_RowProxy,), ns)
+
+    @classmethod
+    def from_rows(cls, name: str, fields: Dict[str, str], rows: Iterable[Sequence[Any]]) -> "RecordArray":
+        ra = cls(name, fields)
+        ra.extend(rows)
+        return ra
+
+    def append(self, *values: Any) -> None:
+        if len(values) != len(self._cols):
+            raise ValueError(f"expected {len(self._cols)} values, got {len(values)}")
+        for col, v in zip(self._cols, values):
+            col.append(v)
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Batch append: transpose rows once, then extend each column in C."""
+        batch = list(rows)
+        if not batch:
+            return
+        if any(len(r) != len(self._cols) for r in batch):
+            raise ValueError(f"every row needs {len(self._cols)} values")
+        for col, values in zip(self._cols, zip(*batch)):
+            col.extend(values)
+
+    def __len__(self) -> int:
+        return len(self._cols[0])
+
+    def __getitem__(self, i: int):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("RecordArray index out of range")
+        return self._row_type(self._cols, i)
+
+    def __iter__(self) -> Iterator[Any]:
+        row_type, cols = self._row_type, self._cols
+        for i in range(len(self)):
+            yield row_type(cols, i)
+
+    def column(self, name: str) -> array:
+        return self._cols[self.fields.index(name)]
+
+    def column_map(self, name: str, fn: Callable[[Any], Any]) -> None:
+        """Replace a column in one pass (pure-Python fallback for vectorized ops)."""
+        col = self.column(name)
+        col[:] = array(col.typecode, map(fn, col))
+
+    def nbytes(self) -> int:
+        return sum(len(col) * col.itemsize for col in self._cols)
+
+    def to_numpy_columns(self) -> Dict[str, Any]:
+        """name -> zero-copy ndarray over each column (numpy required)."""
+        try:
+            import numpy as np  # type: ignore
+        except Exception:
+            raise ImportError("numpy is required for RecordArray.to_numpy_columns")
+        return {f: np.frombuffer(col, dtype=col.typecode) for f, col in zip(self.fields, self._cols)}
+
+    def to_structured(self):
+        """Copy into a numpy structured array with one field per column."""
+        try:
+            import numpy as np  # type: ignore
+        except Exception:
+            raise ImportError("numpy is required for RecordArray.to_structured")
+        dtype = np.dtype([(f, np.dtype(col.typecode)) for f, col in zip(self.fields, self._cols)])
+        out = np.empty(len(self), dtype=dtype)
+        for f, view in self.to_numpy_columns().items():
+            out[f] = view
+        return out
+
+
+@dataclass
+class _SlotPoint:
+    # explicit __slots__ instead of dataclass(slots=True), which needs Python 3.10+
+    __slots__ = ("x", "y")
+    x: float
+    y: float
+
+
+def record_memory(n: int = 100_000) -> Dict[str, float]:
+    """Approximate bytes per (x, y) float record for each representation."""
+    Point = namedtuple("Point", ["x", "y"])
+    xs = [float(i) for i in range(n)]
+    ys = [float(-i) for i in range(n)]
+    float_bytes = 2 * sys.getsizeof(1.0)
+    nts = [Point(x, y) for x, y in zip(xs, ys)]
+    dcs = [_SlotPoint(x, y) for x, y in zip(xs, ys)]
+    tps = list(zip(xs, ys))
+    ra = RecordArray.from_rows("Point", {"x": "d", "y": "d"}, tps)
+
+    def per(objs: List[Any]) -> float:
+        return (sys.getsizeof(objs) + sum(sys.getsizeof(o) for o in objs)) / n + float_bytes
+
+    return {
+        "namedtuple": per(nts),
+        "dataclass_slots": per(dcs),
+        "tuple": per(tps),
+        "RecordArray": ra.nbytes() / n,
+    }
+
+
+def benchmark_cases(n: int = 20000) -> Dict[str, Callable[[], Any]]:
+    """Attribute-access throughput: namedtuple vs dataclass(slots) vs tuple vs RecordArray.
+
+    Discovered by Day1/05-benchmarks.py; memory is compared by record_memory.
+    """
+    Point = namedtuple("Point", ["x", "y"])
+    rows = [(float(i), float(-i)) for i in range(n)]
+    nts = [Point(*r) for r in rows]
+    dcs = [_SlotPoint(*r) for r in rows]
+    ra = RecordArray.from_rows("Point", {"x": "d", "y": "d"}, rows)
+    return {
+        "namedtuple_attr": lambda: sum(p.x + p.y for p in nts),
+        "dataclass_slots_attr": lambda: sum(p.x + p.y for p in dcs),
+        "tuple_index": lambda: sum(p[0] + p[1] for p in rows),
+        "record_array_attr": lambda: sum(p.x + p.y for p in ra),
+        "record_array_columns": lambda: sum(ra.column("x")) + sum(ra.column("y")),
+        "record_array_build": lambda: RecordArray.from_rows("Point", {"x": "d", "y": "d"}, rows),
+    }
+
+
 if __name__ == "__main__":
     res = collections_examples()
     print("Top2:", res["top2"])
@@ -94,4 +485,54 @@ if __name__ == "__main__":
     _nums = [1, 3, -1, -3, 5, 3, 6, 7]
     _k = 3
     assert sliding_window_max(_nums, _k) == [3, 3, 5, 5, 6, 7]
-    print("Sliding window max: PASS")
\ No newline at end of file
+    print("Sliding window max: PASS")
+
+    # multi-stat window agrees with sliding_window_max, across chunk boundaries
+    sw = SlidingWindow(_k)
+    rows = list(sw.feed_chunks([_nums[:2], _nums[2:5], _nums[5:]]))
+    assert [r["max"] for r in rows] == sliding_window_max(_nums, _k)
+    assert [r["min"] for r in rows] == [-1, -3, -3, -3, 3, 3]
+    assert abs(rows[0]["mean"] - 1.0) < 1e-12 and abs(rows[0]["var"] - 8.0 / 3.0) < 1e-12
+    # a 1e9 spike must not leave lasting cancellation error once it has left the window
+    import statistics
+    spiky = [1.0, 1.2, 0.9, 1e9] + [1.0 + 0.1 * (j % 7) for j in range(40)]
+    last = list(SlidingWindow(5).feed(spiky))[-1]
+    assert abs(last["var"] - statistics.pvariance(spiky[-5:])) < 1e-9
+    assert abs(last["sum"] - sum(spiky[-5:])) < 1e-9
+    # every window after the spike leaves is right, not just eventually
+    tiny = [0.01 * ((j * 37) % 11) / 11 for j in range(400)]
+    tiny[150] = 1e9
+    for j, row in enumerate(SlidingWindow(100).feed(tiny)):
+        if j > 150:
+            want = statistics.pvariance(tiny[j : j + 100])
+            assert abs(row["var"] - want) <= 1e-9 * want, (j, row["var"], want)
+    print("SlidingWindow: PASS")
+
+    # vectorized path (or its fallback) agrees with the deque loop
+    assert list(sliding_window_max_numpy(_nums, _k)) == sliding_window_max(_nums, _k)
+    assert list(sliding_window_min_numpy(_nums, _k)) == sliding_window_min(_nums, _k)
+    assert len(sliding_window_max_numpy(_nums, 0)) == 0 and len(sliding_window_max_numpy(_nums, 99)) == 0
+    try:
+        import numpy as np  # type: ignore
+
+        # NaN only poisons the windows that contain it
+        holes = np.array([1.0, 5.0, 2.0, np.nan, 3.0, 1.0, 0.0, 4.0, 2.0, 1.0])
+        view = np.lib.stride_tricks.sliding_window_view(holes, _k)
+        np.testing.assert_array_equal(sliding_window_max_numpy(holes, _k), view.max(axis=1))
+        np.testing.assert_array_equal(sliding_window_min_numpy(holes, _k), view.min(axis=1))
+        clean = ~np.isnan(view).any(axis=1)
+        assert list(sliding_window_max_numpy(holes, _k)[clean]) == list(np.array(sliding_window_max(holes.tolist(), _k))[clean])
+    except ImportError:
+        pass
+    print("Vectorized sliding window: PASS")
+
+    # columnar records behave like namedtuple rows at a fraction of the memory
+    pts = RecordArray.from_rows("Point", {"x": "d", "y": "d"}, [(3, 4), (1, 2)])
+    pts.append(5, 6)
+    p = pts[0]
+    assert (p.x, p.y) == (3.0, 4.0) and pts[-1] == (5.0, 6.0) and repr(p) == "Point(x=3.0, y=4.0)"
+    p.x = 7
+    assert list(pts.column("x")) == [7.0, 1.0, 5.0]
+    print("RecordArray: PASS")
+    for k, v in record_memory(100_000).items():
+        print(f"  {k:16s}: {v:6.1f} bytes/record")
\ No newline at end of file
@@ -5,6 +5,13 @@ Functions:
 - two_sum_bruteforce: O(n^2)
 - two_sum_hash: O(n) average
 - two_sum_two_pointers: O(n log n) on sorted copy
+- IntIntMap / IntIndexLists: flat-array open-addressing map and CSR index lists,
+  used by two_sum_hash / two_sum_all_pairs with backend="flat"
+- TwoSumIndex: value -> indices map built once, reused across many targets
+- two_sum_all_pairs_stream: out-of-core all-pairs over binary files / memmaps via
+  hash-partitioned spill files; yields pairs lazily with bounded memory
+- two_sum_numpy / two_sum_all_pairs_numpy: vectorized argsort + searchsorted engine
+  (numpy optional; falls back to the pure-Python versions when missing)
 
 Theory: See Day1/THEORY.md §6 for trade-offs (time/space, duplicates, index retention,
 and when to prefer sorting vs hashing under memory constraints).
@@ -13,8 +20,13 @@ Run this file to see quick correctness checks and a small benchmark.
 """
 
 from __future__ import annotations
-from typing import Optional, Sequence, Tuple, Dict, List
+from typing import Callable, Optional, Sequence, Tuple, Dict, Iterable, Iterator, List
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+import os
 import random
+import tempfile
 import time
 
 
@@ -27,8 +39,9 @@ def two_sum_bruteforce(nums: Sequence[int], target: int) -> Optional[Tuple[int,
     return None
 
 
-def two_sum_hash(nums: Sequence[int], target: int) -> Optional[Tuple[int, int]]:
-    seen: Dict[int, int] = {}
+def two_sum_hash(nums: Sequence[int], target: int, backend: str = "dict") -> Optional[Tuple[int, int]]:
+    """backend="flat" swaps the dict for an IntIntMap (flat int64 arrays)."""
+    seen = _new_map(backend)
     for j, x in enumerate(nums):
         need = target - x
         if need in seen:
@@ -53,7 +66,7 @@ def two_sum_two_pointers(nums: Sequence[int], target: int) -> Optional[Tuple[int
     return None
 
 
-def two_sum_all_pairs(nums: Sequence[int], target: int) -> List[Tuple[int, int]]:
+def two_sum_all_pairs(nums: Sequence[int], target: int, backend: str = "dict") -> List[Tuple[int, int]]:
     """Return all unique index pairs (i, j), i < j, such that nums[i] + nums[j] == target.
 
     Strategy:
@@ -63,14 +76,27 @@ def two_sum_all_pairs(nums: Sequence[int], target: int) -> List[Tuple[int, int]]
       - If v == c: all index combinations within indices[v]
     Returns pairs sorted lexicographically.
     Complexity: O(n + a) where a is number of output pairs.
-    """
-    from collections import defaultdict
 
+    backend="flat" builds the value -> indices map as IntIndexLists (CSR arrays)
+    instead of a dict of lists.
+    """
+    if backend == "flat":
+        return _pairs_from_index(IntIndexLists(nums), target)
+    if backend != "dict":
+        raise ValueError(f"unknown backend {backend!r}; use 'dict' or 'flat'")
     idxs: Dict[int, List[int]] = defaultdict(list)
     for i, v in enumerate(nums):
         idxs[v].append(i)
+    return _pairs_from_index(idxs, target)
+
 
-    pairs: List[Tuple[int, int]] = []
+def _pairs_from_index(idxs: Dict[int, List[int]], target: int) -> List[Tuple[int, int]]:
+    """All-pairs pass over a prebuilt value -> ascending indices map."""
+    return sorted(set(_iter_index_pairs(idxs, target)))
+
+
+def _iter_index_pairs(idxs: Dict[int, List[int]], target: int) -> Iterator[Tuple[int, int]]:
+    """Lazily yield each (i, j), i < j, once; order follows the map, not sorted."""
     seen_vals = set()
     for v in list(idxs.keys()):
         if v in seen_vals:
@@ -82,7 +108,7 @@ def two_sum_all_pairs(nums: Sequence[int], target: int) -> List[Tuple[int, int]]
         if v < c:
             for i in idxs[v]:
                 for j in idxs[c]:
-                    pairs.append((i, j) if i < j else (j, i))
+                    yield (i, j) if i < j else (j, i)
             # processed both v and c
             seen_vals.add(v)
             seen_vals.add(c)
@@ -92,49 +118,434 @@ def two_sum_all_pairs(nums: Sequence[int], target: int) -> List[Tuple[int, int]]
             for a in range(m):
                 for b in range(a + 1, m):
                     i, j = lst[a], lst[b]
-                    pairs.append((i, j))
+                    yield i, j
             seen_vals.add(v)
         else:
             # v > c: defer processing to when we encounter c (the smaller value)
             seen_vals.add(v)
 
-    pairs = sorted(set(pairs))
-    return pairs
+
+_EMPTY = -(1 << 63)  # sentinel marking a free slot; this key cannot be stored
+
+
+class IntIntMap:
+    """Insert-only int64 -> int64 hash map in two flat arrays.
+
+    Open addressing with linear probing over a power-of-two table kept at most
+    half full; keys are scattered with a Fibonacci multiplicative hash. Each
+    slot costs 16 bytes (key + value) and there are 2-4 slots per entry, so
+    32-64 bytes per entry, versus ~80 for a dict with boxed int keys. Lookups
+    run a Python-level probe loop, so they are slower than dict's C code; the
+    win is memory (see hashmap_memory / benchmark_cases).
+    """
+
+    __slots__ = ("_keys", "_vals", "_mask", "_shift", "_len")
+
+    def __init__(self, capacity: int = 8) -> None:
+        size = 8
+        while size < 2 * capacity:
+            size <<= 1
+        self._alloc(size)
+
+    def _alloc(self, size: int) -> None:
+        self._keys = array("q", [_EMPTY]) * size
+        self._vals = array("q", [0]) * size
+        self._mask = size - 1
+        self._shift = 64 - (size.bit_length() - 1)
+        self._len = 0
+
+    def _slot(self, key: int) -> int:
+        keys, mask = self._keys, self._mask
+        # top bits of the 64-bit product (Python ints do not wrap, so truncate first)
+        i = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self._shift
+        while True:
+            k = keys[i]
+            if k == key or k == _EMPTY:
+                return i
+            i = (i + 1) & mask
+
+    def __setitem__(self, key: int, value: int) -> None:
+        if key == _EMPTY:
+            raise ValueError("key -2**63 is reserved")
+        i = self._slot(key)
+        if self._keys[i] == _EMPTY:
+            if 2 * (self._len + 1) > self._mask + 1:
+                self._grow()
+                i = self._slot(key)
+            self._keys[i] = key
+            self._len += 1
+        self._vals[i] = value
+
+    def _grow(self) -> None:
+        old_keys, old_vals = self._keys, self._vals
+        self._alloc(2 * len(old_keys))
+        for k, v in zip(old_keys, old_vals):
+            if k != _EMPTY:
+                i = self._slot(k)
+                self._keys[i] = k
+                self._vals[i] = v
+                self._len += 1
+
+    def get(self, key: int, default: Optional[int] = None) -> Optional[int]:
+        i = self._slot(key)
+        return default if self._keys[i] == _EMPTY else self._vals[i]
+
+    def __getitem__(self, key: int) -> int:
+        i = self._slot(key)
+        if self._keys[i] == _EMPTY:
+            raise KeyError(key)
+        return self._vals[i]
+
+    def __contains__(self, key: int) -> bool:
+        return self._keys[self._slot(key)] != _EMPTY
+
+    def __len__(self) -> int:
+        return self._len
+
+    def keys(self) -> Iterator[int]:
+        return (k for k in self._keys if k != _EMPTY)
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self._keys) + len(self._vals)) * 8
+
+
+class IntIndexLists:
+    """Read-only value -> ascending indices map in CSR form (no list per value).
+
+    Built in two counting passes: (1) assign each distinct value a group id in
+    an IntIntMap and count its occurrences, (2) prefix-sum the counts into
+    offsets and scatter indices into one flat array. idx[v] is a zero-copy
+    memoryview slice. Supports the mapping API _pairs_from_index needs.
+    """
+
+    def __init__(self, nums: Sequence[int]) -> None:
+        self._gid = IntIntMap(max(8, len(nums) // 2))
+        counts = array("q")
+        for v in nums:
+            g = self._gid.get(v)
+            if g is None:
+                self._gid[v] = len(counts)
+                counts.append(1)
+            else:
+                counts[g] += 1
+        self._offsets = array("q", [0]) * (len(counts) + 1)
+        for g, c in enumerate(counts):
+            self._offsets[g + 1] = self._offsets[g] + c
+        fill = array("q", self._offsets[:-1])
+        self._indices = array("q", [0]) * len(nums)
+        for i, v in enumerate(nums):
+            g = self._gid[v]
+            self._indices[fill[g]] = i
+            fill[g] += 1
+
+    def __contains__(self, value: int) -> bool:
+        return value in self._gid
+
+    def __getitem__(self, value: int) -> memoryview:
+        g = self._gid[value]
+        return memoryview(self._indices)[self._offsets[g]:self._offsets[g + 1]]
+
+    def keys(self) -> Iterator[int]:
+        return self._gid.keys()
+
+    def __len__(self) -> int:
+        return len(self._gid)
+
+    @property
+    def nbytes(self) -> int:
+        return self._gid.nbytes + (len(self._offsets) + len(self._indices)) * 8
+
+
+def _new_map(backend: str):
+    if backend == "dict":
+        return {}
+    if backend == "flat":
+        return IntIntMap()
+    raise ValueError(f"unknown backend {backend!r}; use 'dict' or 'flat'")
+
+
+def hashmap_memory(n: int = 100_000) -> Dict[str, float]:
+    """Approximate bytes per entry: dict of boxed ints vs IntIntMap, and
+    defaultdict(list) grouping vs IntIndexLists (n values, ~n/2 distinct)."""
+    import sys
+
+    keys = list(range(10_000, 10_000 + n))
+    d = {k: k for k in keys}
+    flat = IntIntMap()
+    for k in keys:
+        flat[k] = k
+    dict_bytes = sys.getsizeof(d) + sum(sys.getsizeof(k) for k in keys)  # values share key objects
+
+    nums = [10_000 + i // 2 for i in range(n)]
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i, v in enumerate(nums):
+        groups[v].append(i)
+    group_bytes = sys.getsizeof(groups) + sum(
+        sys.getsizeof(k) + sys.getsizeof(lst) + sum(sys.getsizeof(i) for i in lst) for k, lst in groups.items()
+    )
+    return {
+        "dict_bytes_per_entry": dict_bytes / n,
+        "flat_bytes_per_entry": flat.nbytes / n,
+        "defaultdict_list_bytes_per_index": group_bytes / n,
+        "csr_bytes_per_index": IntIndexLists(nums).nbytes / n,
+    }
+
+
+class TwoSumIndex:
+    """Reusable value -> indices index for many two-sum queries on the same nums.
+
+    two_sum_hash rebuilds its `seen` dict on every call; here the map is built
+    once (O(n)) and each query only walks the distinct values. Index lists stay
+    ascending, so append/extend keep the index valid as the array grows.
+
+    Answers match the one-shot functions:
+    - query(t)      == two_sum_hash(nums, t)       O(d log n), d = distinct values
+    - query_all(t)  == two_sum_all_pairs(nums, t)  O(d + a)
+    """
+
+    def __init__(self, nums: Iterable[int] = ()) -> None:
+        self._idxs: Dict[int, List[int]] = defaultdict(list)
+        self._n = 0
+        self.extend(nums)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, x: int) -> None:
+        self._idxs[x].append(self._n)
+        self._n += 1
+
+    def extend(self, xs: Iterable[int]) -> None:
+        for x in xs:
+            self.append(x)
+
+    def query(self, target: int) -> Optional[Tuple[int, int]]:
+        """First pair in two_sum_hash order: smallest j, then latest i < j."""
+        best_j = self._n
+        best_c = None
+        for v, js in self._idxs.items():
+            c = target - v
+            cs = self._idxs.get(c)
+            if not cs:
+                continue
+            # earliest j in js that has some complement index before it
+            k = 1 if c == v else bisect_right(js, cs[0])
+            if k < len(js) and js[k] < best_j:
+                best_j, best_c = js[k], c
+        if best_c is None:
+            return None
+        cs = self._idxs[best_c]
+        return cs[bisect_left(cs, best_j) - 1], best_j
+
+    def query_all(self, target: int) -> List[Tuple[int, int]]:
+        return _pairs_from_index(self._idxs, target)
+
+    def query_many(self, targets: Iterable[int]) -> List[Optional[Tuple[int, int]]]:
+        return [self.query(t) for t in targets]
+
+
+def _iter_int_chunks(source, chunk_size: int, typecode: str) -> Iterator[Sequence[int]]:
+    """Yield consecutive chunks of ints from a raw binary file path or a sliceable
+    sequence (numpy.memmap, ndarray, array.array, list)."""
+    if isinstance(source, (str, os.PathLike)):
+        itemsize = array(typecode).itemsize
+        with open(source, "rb") as f:
+            while True:
+                buf = f.read(chunk_size * itemsize)
+                if not buf:
+                    return
+                chunk = array(typecode)
+                chunk.frombytes(buf)
+                yield chunk
+    else:
+        for start in range(0, len(source), chunk_size):
+            chunk = source[start:start + chunk_size]
+            yield chunk.tolist() if hasattr(chunk, "tolist") else chunk
+
+
+def two_sum_all_pairs_stream(
+    source,
+    target: int,
+    chunk_size: int = 1 << 20,
+    n_partitions: int = 64,
+    typecode: str = "q",
+    spill_dir: Optional[str] = None,
+) -> Iterator[Tuple[int, int]]:
+    """Out-of-core two_sum_all_pairs: yield every (i, j), i < j, exactly once.
+
+    `source` is a path to a raw binary file of `typecode` ints (e.g. written by
+    array.tofile or ndarray.tofile) or an in-memory/memmapped sequence, such as
+    the np.memmap from numpy_memmap_example.
+
+    Pass 1 streams `chunk_size` values at a time and appends (index, value)
+    records to one of `n_partitions` spill files, keyed by hash(min(v, target - v)):
+    a value and its complement share that key, so every pair lives inside one
+    partition. Pass 2 loads one partition at a time, builds its value -> indices
+    map and yields its pairs lazily.
+
+    Peak memory ~ chunk_size + the largest partition (about n / n_partitions for
+    non-skewed data), independent of the output size. Pairs are not globally
+    sorted; sorted(two_sum_all_pairs_stream(...)) == two_sum_all_pairs(...).
+    """
+    if chunk_size <= 0 or n_partitions <= 0:
+        raise ValueError("chunk_size and n_partitions must be positive")
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as tmp:
+        paths = [os.path.join(tmp, f"part-{p:04d}.bin") for p in range(n_partitions)]
+        files = [open(path, "wb") for path in paths]
+        try:
+            offset = 0
+            for chunk in _iter_int_chunks(source, chunk_size, typecode):
+                bufs = [array("q") for _ in range(n_partitions)]
+                for i, v in enumerate(chunk, offset):
+                    bufs[hash(min(v, target - v)) % n_partitions].extend((i, v))
+                for f, buf in zip(files, bufs):
+                    if buf:
+                        buf.tofile(f)
+                offset += len(chunk)
+        finally:
+            for f in files:
+                f.close()
+
+        for path in paths:
+            records = array("q")
+            with open(path, "rb") as f:
+                records.frombytes(f.read())
+            idxs: Dict[int, List[int]] = defaultdict(list)
+            for k in range(0, len(records), 2):
+                idxs[records[k + 1]].append(records[k])  # indices arrive ascending
+            del records
+            yield from _iter_index_pairs(idxs, target)
+
+
+def _as_int_array(nums):
+    """Return a 1-D integer ndarray view of nums (list, ndarray or buffer object)."""
+    import numpy as np  # type: ignore
+
+    arr = np.asarray(nums)
+    if arr.ndim != 1:
+        arr = arr.reshape(-1)
+    if arr.size and not np.issubdtype(arr.dtype, np.integer):
+        raise TypeError(f"integer input required, got dtype {arr.dtype}")
+    return arr.astype(np.int64, copy=False)
+
+
+def _complement_ranges(arr, target: int):
+    """Stable argsort of arr plus [lo, hi) ranges of target - arr in sorted order."""
+    import numpy as np  # type: ignore
+
+    order = np.argsort(arr, kind="stable")  # equal values keep ascending indices
+    sv = arr[order]
+    need = target - arr
+    lo = np.searchsorted(sv, need, side="left")
+    hi = np.searchsorted(sv, need, side="right")
+    return order, lo, hi
+
+
+def two_sum_numpy(nums, target: int) -> Optional[Tuple[int, int]]:
+    """Vectorized first-pair query; same answer as two_sum_hash.
+
+    two_sum_hash returns the smallest j that has a partner, paired with the
+    latest i < j holding the complement. With a stable argsort, the earliest
+    index holding complement(j) is order[lo[j]], so j has a partner iff that
+    index is < j. One more searchsorted inside the complement's run picks i.
+    O(n log n) in C; falls back to two_sum_hash when numpy is missing.
+    """
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return two_sum_hash(nums, target)
+
+    arr = _as_int_array(nums)
+    n = arr.size
+    if n < 2:
+        return None
+    order, lo, hi = _complement_ranges(arr, target)
+    first = order[np.minimum(lo, n - 1)]
+    ok = (hi > lo) & (first < np.arange(n))
+    if not ok.any():
+        return None
+    j = int(np.argmax(ok))
+    run = order[lo[j]:hi[j]]  # indices holding target - nums[j], ascending
+    i = int(run[np.searchsorted(run, j) - 1])
+    return i, j
+
+
+def two_sum_all_pairs_numpy(nums, target: int):
+    """Vectorized all-pairs query; same pairs as two_sum_all_pairs.
+
+    Returns an int64 array of shape (a, 2) with rows (i, j), i < j, sorted
+    lexicographically. Every position p is expanded against the run of its
+    complement in sorted order; keeping only i < j counts each pair once.
+    O(n log n + a) time and memory. Falls back to two_sum_all_pairs
+    (a list of tuples) when numpy is missing.
+    """
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return two_sum_all_pairs(nums, target)
+
+    arr = _as_int_array(nums)
+    n = arr.size
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    order, lo, hi = _complement_ranges(arr, target)
+    counts = hi - lo
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    src = np.repeat(np.arange(n), counts)
+    starts = np.cumsum(counts) - counts
+    partner = order[lo[src] + (np.arange(total) - starts[src])]
+    keep = src < partner
+    i, j = src[keep], partner[keep]
+    perm = np.lexsort((j, i))
+    return np.stack((i[perm], j[perm]), axis=1)
+
+
+def benchmark_cases(n: int = 1000) -> Dict[str, Callable[[], object]]:
+    """Zero-arg callables for each two-sum strategy at size n (same data as bench_two_sum).
+
+    Brute force is only included for n <= 3000. Discovered and run by
+    Day1/05-benchmarks.py.
+    """
+    rng = random.Random(42)
+    nums = [rng.randrange(n * 2) for _ in range(n)]
+    target = nums[n // 3] + nums[2 * n // 3]
+    cases: Dict[str, Callable[[], object]] = {}
+    if n <= 3000:
+        cases["bruteforce"] = lambda: two_sum_bruteforce(nums, target)
+    cases["hash"] = lambda: two_sum_hash(nums, target)
+    cases["two_pointers"] = lambda: two_sum_two_pointers(nums, target)
+
+    # dict vs flat open-addressing map: lookup throughput and grouping
+    d = {v: i for i, v in enumerate(nums)}
+    flat = IntIntMap(n)
+    for i, v in enumerate(nums):
+        flat[v] = i
+    probes = nums[::2]
+    cases["dict_lookup"] = lambda: [d.get(v) for v in probes]
+    cases["flat_lookup"] = lambda: [flat.get(v) for v in probes]
+    cases["all_pairs_dict"] = lambda: two_sum_all_pairs(nums, target)
+    cases["all_pairs_flat"] = lambda: two_sum_all_pairs(nums, target, backend="flat")
+    return cases
 
 
 def bench_two_sum(sizes: List[int] = [1000, 5000], reps: int = 2) -> List[Dict[str, float]]:
     """Return a list of timing dicts for each input size.
 
     - Skips brute-force for sizes > 3000 by setting it to None
+    For warmup, medians/p95, GC control and memory use Day1/05-benchmarks.py.
     """
     results: List[Dict[str, float]] = []
-    rng = random.Random(42)
     for n in sizes:
-        nums = [rng.randrange(n * 2) for _ in range(n)]
-        target = nums[n // 3] + nums[2 * n // 3]
-        row: Dict[str, float] = {"n": float(n)}
-
-        # bruteforce (only small n)
-        if n <= 3000:
+        row: Dict[str, float] = {"n": float(n), "bruteforce_s": float("nan")}
+        for name, fn in benchmark_cases(n).items():
             start = time.perf_counter()
             for _ in range(reps):
-                two_sum_bruteforce(nums, target)
-            row["bruteforce_s"] = (time.perf_counter() - start) / reps
-        else:
-            row["bruteforce_s"] = float("nan")
-
-        # hash
-        start = time.perf_counter()
-        for _ in range(reps):
-            two_sum_hash(nums, target)
-        row["hash_s"] = (time.perf_counter() - start) / reps
-
-        # two pointers
-        start = time.perf_counter()
-        for _ in range(reps):
-            two_sum_two_pointers(nums, target)
-        row["two_pointers_s"] = (time.perf_counter() - start) / reps
-
+                fn()
+            row[f"{name}_s"] = (time.perf_counter() - start) / reps
         results.append(row)
     return results
 
@@ -164,3 +575,32 @@ if __name__ == "__main__":
         print("All-pairs exercise: PASS")
     else:
         print("All-pairs exercise: CHECK manually — expected", sorted(expected_pairs))
+
+    # numpy engine agrees with the pure-Python versions (or falls back to them)
+    np_pairs = two_sum_all_pairs_numpy(ex_nums, 4)
+    assert [tuple(map(int, p)) for p in np_pairs] == ex_pairs
+    assert two_sum_numpy(nums, 9) == two_sum_hash(nums, 9)
+    print("NumPy engine: PASS")
+
+    # prebuilt index answers many targets without rebuilding, and can grow
+    index = TwoSumIndex(ex_nums[:4])
+    index.extend(ex_nums[4:])
+    assert index.query_many([4, 9, 100]) == [two_sum_hash(ex_nums, t) for t in (4, 9, 100)]
+    assert index.query_all(4) == ex_pairs
+    print("TwoSumIndex: PASS")
+
+    # out-of-core variant over a raw binary file, tiny chunks to force spilling
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "nums.bin")
+        with open(path, "wb") as f:
+            array("q", ex_nums).tofile(f)
+        streamed = two_sum_all_pairs_stream(path, 4, chunk_size=3, n_partitions=4)
+        assert sorted(streamed) == ex_pairs
+    print("Streaming all-pairs: PASS")
+
+    # flat-array backend gives identical answers with far fewer bytes per entry
+    assert two_sum_hash(ex_nums, 4, backend="flat") == two_sum_hash(ex_nums, 4)
+    assert two_sum_all_pairs(ex_nums, 4, backend="flat") == ex_pairs
+    print("Flat backend: PASS")
+    for k, v in hashmap_memory(100_000).items():
+        print(f"  {k:34s}: {v:6.1f}")
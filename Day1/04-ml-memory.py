@@ -7,33 +7,638 @@ sparse formats (CSR/CSC/COO), memmap, and general memory strategies.
 """
 
 from __future__ import annotations
-from typing import Any, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import functools
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
 
 
-def pandas_downcast_df(df):
-    """Downcast numeric columns to reduce memory footprint (pandas required)."""
+def _smallest_int(lo: Any, hi: Any, nullable: bool, unsigned: bool = False) -> Optional[str]:
+    """Smallest (nullable) int dtype name holding [lo, hi], or None if 64 bits do not."""
+    import numpy as np  # type: ignore
+
+    prefix = "uint" if unsigned else "int"
+    for bits in (8, 16, 32, 64):
+        info = np.iinfo(f"{prefix}{bits}")
+        if info.min <= int(lo) and int(hi) <= info.max:
+            return ("UInt" if unsigned else "Int") + str(bits) if nullable else f"{prefix}{bits}"
+    return None
+
+
+def _parse_dtype(spec: str):
+    """Schema string -> dtype accepted by astype ("Sparse[float32, 0.0]" needs manual parsing)."""
+    if not spec.startswith("Sparse["):
+        return spec
+    import pandas as pd  # type: ignore
+
+    subtype, fill = spec[len("Sparse[") : -1].split(", ")
+    fill_value = int(fill) if "int" in subtype else float(fill)
+    return pd.SparseDtype(subtype, fill_value)
+
+
+def infer_dtype_schema(df, category_max_ratio: float = 0.5, sparse_min_fill: float = 0.9) -> Dict[str, str]:
+    """Pick a compact dtype for every column, inspecting one column at a time.
+
+    - ints -> int8/16/32 (uints -> uint8/16/32) by value range, never wider
+      than the current dtype; floats -> float32 when lossless
+    - integral floats holding NaN -> nullable Int8/16/32/64
+    - numeric columns that are >= sparse_min_fill zeros (or NaNs) -> Sparse[...]
+    - strings/objects with nunique/len <= category_max_ratio -> category
+
+    Returns {column: dtype string}: JSON-friendly, reusable across chunks
+    and files (see apply_dtype_schema and read_csv_in_chunks(schema=...)).
+    Columns whose dtype would not change are left out.
+    """
     try:
         import pandas as pd  # type: ignore
+    except Exception:
+        raise ImportError("pandas is required for infer_dtype_schema")
+    from pandas.api import types as pdt  # type: ignore
+
+    schema: Dict[str, str] = {}
+    for col in df.columns:
+        s = df[col]
+        n = len(s)
+        if n == 0 or pdt.is_bool_dtype(s.dtype) or isinstance(s.dtype, (pd.SparseDtype, pd.CategoricalDtype)):
+            continue
+        if pdt.is_numeric_dtype(s.dtype):
+            na = int(s.isna().sum())
+            if na == n:
+                continue
+            target = None
+            if pdt.is_integer_dtype(s.dtype):
+                nullable = na > 0 or pdt.is_extension_array_dtype(s.dtype)
+                target = _smallest_int(s.min(), s.max(), nullable, unsigned=s.dtype.kind == "u")
+                if target is None or _dtype_bits(target) >= _dtype_bits(str(s.dtype)):
+                    target = str(s.dtype)
+            else:
+                valid = s.dropna()
+                if na and bool((valid == valid.round()).all()):
+                    target = _smallest_int(valid.min(), valid.max(), nullable=True)
+                if target is None:
+                    # float32 only if every value survives the round trip (0.1 or 123456.789 do not)
+                    lossless = _dtype_bits(str(s.dtype)) > 32 and _fits(valid, "float32")
+                    target = "float32" if lossless else str(s.dtype)
+            nullable_int = target[0].isupper()
+            zeros = int((s == 0).sum())
+            if na / n >= sparse_min_fill:
+                # NaN-filled sparse storage is float; float32 holds ints exactly up to 2**24
+                small = target.startswith("float") and _dtype_bits(target) <= 32 or nullable_int and _dtype_bits(target) <= 16
+                target = str(pd.SparseDtype("float32" if small else "float64", float("nan")))
+            elif na == 0 and zeros / n >= sparse_min_fill and not nullable_int:
+                target = f"Sparse[{target}, {0.0 if target.startswith('float') else 0}]"
+        elif pdt.is_object_dtype(s.dtype) or pdt.is_string_dtype(s.dtype):
+            if category_max_ratio <= 0 or s.nunique(dropna=True) / n > category_max_ratio:
+                continue
+            target = "category"
+        else:
+            continue
+        if target != str(s.dtype):
+            schema[col] = target
+    return schema
+
+
+def _dtype_bits(name: str) -> int:
+    import numpy as np  # type: ignore
+
+    return np.dtype(name.lower()).itemsize * 8  # "Int16" -> int16, "UInt8" -> uint8
+
+
+def _fits(s, spec: str) -> bool:
+    """True if every value of s survives astype(spec) unchanged."""
+    import numpy as np  # type: ignore
+    from pandas.api import types as pdt  # type: ignore
+
+    if spec == "category" or not pdt.is_numeric_dtype(s.dtype) or pdt.is_bool_dtype(s.dtype):
+        return True
+    sparse = spec.startswith("Sparse[")
+    base = np.dtype(str(_parse_dtype(spec).subtype) if sparse else spec.lower())
+    valid = s.dropna()
+    if len(valid) == 0:
+        return True
+    if base.kind in "iu":
+        if len(valid) < len(s) and (sparse or not spec[0].isupper()):
+            return False  # NaN has no numpy-int representation
+        if s.dtype.kind == "f" and not bool((valid == valid.round()).all()):
+            return False
+        info = np.iinfo(base)
+        return info.min <= int(valid.min()) and int(valid.max()) <= info.max
+    if base.kind == "f" and s.dtype.kind in "iuf":
+        a = valid.to_numpy()
+        with np.errstate(over="ignore"):
+            return bool(np.array_equal(a.astype(base).astype(a.dtype), a))
+    return True
+
+
+def apply_dtype_schema(df, schema: Dict[str, str], inplace: bool = False):
+    """Convert columns per schema, one column at a time.
+
+    With inplace=False the result is a shallow copy: unchanged columns share
+    memory with df and only one converted column is materialized at a time,
+    so peak memory stays near the size of df instead of doubling it.
+
+    A schema usually comes from a sample, so every numeric conversion is
+    checked first (range, NaN, float32 round trip); a column that does not
+    fit gets the dtype infer_dtype_schema picks for its actual values
+    instead of being wrapped or truncated.
+    """
+    out = df if inplace else df.copy(deep=False)
+    for col, spec in schema.items():
+        if col not in out.columns or str(out[col].dtype) == spec:
+            continue
+        if not _fits(out[col], spec):
+            spec = infer_dtype_schema(out[[col]]).get(col, str(out[col].dtype))
+        out[col] = out[col].astype(_parse_dtype(spec))
+    return out
+
+
+def pandas_downcast_df(
+    df,
+    inplace: bool = False,
+    schema: Optional[Dict[str, str]] = None,
+    category_max_ratio: float = 0.5,
+    sparse_min_fill: float = 0.9,
+):
+    """Shrink a DataFrame: downcast numbers, nullable ints, category and sparse columns (pandas required).
+
+    Pass a precomputed `schema` (from infer_dtype_schema) to skip inference
+    (values are still range-checked, see apply_dtype_schema); set
+    category_max_ratio=0 / sparse_min_fill>1 to disable those conversions.
+    """
+    try:
+        import pandas as pd  # type: ignore  # noqa: F401
     except Exception:
         raise ImportError("pandas is required for pandas_downcast_df")
 
-    df = df.copy()
-    for col in df.select_dtypes(include=["int", "int64", "int32"]).columns:
-        df[col] = pd.to_numeric(df[col], downcast="integer")
-    for col in df.select_dtypes(include=["float"]).columns:
-        df[col] = pd.to_numeric(df[col], downcast="float")
-    return df
+    if schema is None:
+        schema = infer_dtype_schema(df, category_max_ratio, sparse_min_fill)
+    return apply_dtype_schema(df, schema, inplace=inplace)
+
+
+def _downcast_chunk(df):
+    """Numeric-only downcast for independently parsed chunks.
 
+    Category and sparse dtypes are left out here: each chunk would get its
+    own categories/fill layout, and concatenating such chunks falls back to
+    object/dense columns. Use a shared schema for those (read_csv_in_chunks).
+    """
+    return pandas_downcast_df(df, inplace=True, category_max_ratio=0.0, sparse_min_fill=2.0)
 
-def read_csv_in_chunks(path: str, chunksize: int = 100_000):
-    """Yield downcasted chunks from a CSV (pandas required)."""
+
+def csv_read_dtypes(schema: Dict[str, str]) -> Dict[str, str]:
+    """Schema -> pd.read_csv(dtype=...) mapping for the conversions the parser can do safely.
+
+    Only categories are parsed directly: read_csv wraps out-of-range ints
+    silently (300 as int8 -> 44), so numeric narrowing is left to the
+    range-checked apply_dtype_schema.
+    """
+    return {col: spec for col, spec in schema.items() if spec == "category"}
+
+
+def read_csv_in_chunks(path: str, chunksize: int = 100_000, schema: Optional[Dict[str, str]] = None):
+    """Yield downcasted chunks from a CSV (pandas required).
+
+    Without a schema each chunk gets a numeric-only downcast (_downcast_chunk).
+    With a `schema` no per-chunk inference runs: categories come straight
+    from the parser (read_csv(dtype=...)) and the numeric casts are applied
+    with range checks, widening a column whose values outgrow the schema.
+    """
     try:
         import pandas as pd  # type: ignore
     except Exception:
         raise ImportError("pandas is required for read_csv_in_chunks")
 
-    for chunk in pd.read_csv(path, chunksize=chunksize):
-        yield pandas_downcast_df(chunk)
+    if schema is None:
+        with pd.read_csv(path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield _downcast_chunk(chunk)
+        return
+    parsed = csv_read_dtypes(schema)
+    rest = {col: spec for col, spec in schema.items() if col not in parsed}
+    with pd.read_csv(path, chunksize=chunksize, dtype=parsed) as reader:
+        for chunk in reader:
+            yield apply_dtype_schema(chunk, rest, inplace=True)
+
+
+def _csv_body_offsets(path: str, chunk_bytes: int) -> Tuple[int, List[int]]:
+    """Return (header_end, offsets): body split into ~chunk_bytes ranges at line starts."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        header_end = f.tell()
+        offsets = [header_end]
+        while offsets[-1] < size:
+            f.seek(min(offsets[-1] + chunk_bytes, size))
+            f.readline()
+            offsets.append(min(max(f.tell(), offsets[-1] + 1), size))
+    return header_end, offsets
+
+
+# read_csv options that change how the header line itself is tokenized/decoded
+_HEADER_KWARGS = ("sep", "delimiter", "encoding", "encoding_errors", "quotechar", "quoting", "escapechar", "doublequote", "skipinitialspace", "dialect", "engine")
+
+
+def _csv_header_names(path: str, read_kwargs: dict) -> List[str]:
+    """Column names, parsed with the same delimiter/encoding/quoting as the body."""
+    import pandas as pd  # type: ignore
+
+    header_kwargs = {k: v for k, v in read_kwargs.items() if k in _HEADER_KWARGS}
+    return list(pd.read_csv(path, nrows=0, **header_kwargs).columns)
+
+
+def _parse_csv_range(path: str, start: int, end: int, names: List[str], downcast: bool, read_kwargs: dict):
+    """Worker: parse one newline-aligned byte range (no header) into a DataFrame."""
+    import pandas as pd  # type: ignore
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(data), header=None, names=names, **read_kwargs)
+    return _downcast_chunk(df) if downcast else df
+
+
+def _parse_and_map(path, start, end, names, downcast, read_kwargs, map_fn):
+    return map_fn(_parse_csv_range(path, start, end, names, downcast, read_kwargs))
+
+
+def _pipelined(submit, ranges, workers: int, ordered: bool, prefetch: Optional[int]) -> Iterator[Any]:
+    """Run submit(start, end) for each range in a pool with at most `prefetch`
+    tasks in flight; a new range is only submitted when a result is taken
+    (backpressure). Yields results in file order or as they complete."""
+    prefetch = prefetch or 2 * workers
+    pending = iter(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        inflight: deque = deque()
+        for start, end in pending:
+            inflight.append(submit(ex, start, end))
+            if len(inflight) >= prefetch:
+                break
+        while inflight:
+            if ordered:
+                fut = inflight.popleft()
+            else:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                fut = next(iter(done))
+                inflight.remove(fut)
+            result = fut.result()
+            nxt = next(pending, None)
+            if nxt is not None:
+                inflight.append(submit(ex, *nxt))
+            yield result
+
+
+def parallel_read_csv(
+    path: str,
+    workers: Optional[int] = None,
+    chunk_bytes: int = 32 << 20,
+    ordered: bool = True,
+    prefetch: Optional[int] = None,
+    downcast: bool = True,
+    **read_kwargs: Any,
+):
+    """Pipelined read_csv_in_chunks: parse + downcast chunks in a process pool.
+
+    The body is split at newline-aligned byte offsets (~chunk_bytes each); each
+    worker seeks to its range, parses it with pandas and runs
+    pandas_downcast_df, so parsing overlaps across cores and with the
+    consumer. At most `prefetch` chunks (default 2 * workers) are in flight,
+    which caps memory when the consumer is slower than the parsers.
+    ordered=False yields chunks as they complete instead of in file order.
+    Ordered chunks carry a continuous RangeIndex (row numbers in the file);
+    unordered chunks cannot know their offset and are indexed from 0 each.
+    Extra keyword arguments go to pd.read_csv (e.g. sep, usecols, dtype) and
+    are used for the header line too.
+    Assumes no quoted field contains a newline.
+    """
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        raise ImportError("pandas is required for parallel_read_csv")
+
+    names = _csv_header_names(path, read_kwargs)
+    _, offsets = _csv_body_offsets(path, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+
+    def submit(ex, start, end):
+        return ex.submit(_parse_csv_range, path, start, end, names, downcast, read_kwargs)
+
+    row = 0
+    for df in _pipelined(submit, zip(offsets, offsets[1:]), workers, ordered, prefetch):
+        if ordered:
+            df.index = pd.RangeIndex(row, row + len(df))
+            row += len(df)
+        yield df
+
+
+def parallel_csv_reduce(
+    path: str,
+    map_fn: Callable[[Any], Any],
+    reduce_fn: Callable[[Any, Any], Any],
+    initial: Any,
+    workers: Optional[int] = None,
+    chunk_bytes: int = 32 << 20,
+    downcast: bool = True,
+    **read_kwargs: Any,
+) -> Any:
+    """Map-reduce over CSV chunks: map_fn(df) runs in the workers (must be a
+    picklable top-level function) and only its small result travels back;
+    reduce_fn folds results in completion order, so it should be associative
+    and commutative (sums, counts, min/max)."""
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        raise ImportError("pandas is required for parallel_csv_reduce")
+
+    names = _csv_header_names(path, read_kwargs)
+    _, offsets = _csv_body_offsets(path, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+
+    def submit(ex, start, end):
+        return ex.submit(_parse_and_map, path, start, end, names, downcast, read_kwargs, map_fn)
+
+    acc = initial
+    for part in _pipelined(submit, zip(offsets, offsets[1:]), workers, False, None):
+        acc = reduce_fn(acc, part)
+    return acc
+
+
+def _numeric_column_sums(df) -> dict:
+    import pandas as pd  # type: ignore
+
+    return {c: float(pd.to_numeric(df[c], errors="coerce").sum()) for c in df.columns}
+
+
+def parallel_csv_column_sums(path: str, workers: Optional[int] = None, chunk_bytes: int = 32 << 20, **read_kwargs: Any) -> dict:
+    """chunked_csv_sum for every column at once, scaled across cores.
+
+    Non-numeric values count as NaN and are skipped, like chunked_csv_sum.
+    Pass usecols=[...] to restrict the parse.
+    """
+    def add(acc: dict, part: dict) -> dict:
+        for k, v in part.items():
+            acc[k] = acc.get(k, 0.0) + v
+        return acc
+
+    return parallel_csv_reduce(
+        path, _numeric_column_sums, add, {}, workers, chunk_bytes, downcast=False, **read_kwargs
+    )
+
+
+def infer_csv_schema(path: str, sample_rows: int = 100_000, **infer_kwargs: Any) -> Dict[str, str]:
+    """infer_dtype_schema on the first `sample_rows` rows of a CSV (pandas required).
+
+    Columns the sample keeps unchanged (e.g. high-cardinality strings) are
+    absent. Ranges are only as good as the sample; build_columnar_cache
+    re-checks every chunk and widens as needed.
+    """
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        raise ImportError("pandas is required for infer_csv_schema")
+
+    return infer_dtype_schema(pd.read_csv(path, nrows=sample_rows), **infer_kwargs)
+
+
+def _storage_dtype(spec: str):
+    """Schema dtype -> numpy dtype used on disk (nullable ints become NaN floats, sparse is stored dense)."""
+    import numpy as np  # type: ignore
+
+    if spec.startswith("Sparse["):
+        return np.dtype(_parse_dtype(spec).subtype)
+    if spec[0].isupper():  # Int8.. / UInt8..
+        return np.dtype("float32")
+    return np.dtype(spec)
+
+
+def _fitting_dtype(a):
+    """Smallest dtype that holds every value of a numeric array exactly."""
+    import numpy as np  # type: ignore
+
+    if a.dtype.kind in "iu" and len(a):
+        return np.dtype(_smallest_int(a.min(), a.max(), nullable=False, unsigned=a.dtype.kind == "u") or a.dtype)
+    if a.dtype.kind == "f":
+        small = a.astype("float32")
+        with np.errstate(over="ignore"):
+            if np.array_equal(small, a, equal_nan=True):
+                return np.dtype("float32")
+    return a.dtype
+
+
+def _widen(cur, new, lowest: Any):
+    """np.promote_types, except that int + uint stays an integer when nothing is negative."""
+    import numpy as np  # type: ignore
+
+    out = np.promote_types(cur, new)
+    if out.kind == "f" and cur.kind in "iu" and new.kind in "iu":
+        if lowest < 0:
+            raise OverflowError("column mixes negative values with values above the int64 range")
+        return np.dtype("uint64")
+    return out
+
+
+def _csv_cache_key(path: str, schema: Optional[Dict[str, str]]) -> dict:
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "schema": schema}
+
+
+def _default_cache_dir(path: str) -> str:
+    return path + ".columns"
+
+
+class _TextColumn(Exception):
+    """A column that looked numeric turned out to hold text; rebuild it dictionary-encoded."""
+
+    def __init__(self, column: str) -> None:
+        super().__init__(column)
+        self.column = column
+
+
+def _write_columns(path: str, out_dir: str, schema: Dict[str, str], text: set, chunksize: int) -> dict:
+    """One pass over the CSV into out_dir/<i>.bin; returns the manifest (without the source key)."""
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+    from pandas.api import types as pdt  # type: ignore
+
+    columns: Dict[str, dict] = {}
+    files: Dict[str, Any] = {}
+    lookup: Dict[str, Dict[Any, int]] = {}
+    lowest: Dict[str, Any] = {}
+    rows = 0
+    try:
+        with pd.read_csv(path, chunksize=chunksize, dtype={col: str for col in text}) as reader:
+            for chunk in reader:
+                for col in chunk.columns:
+                    s = chunk[col]
+                    meta = columns.get(col)
+                    if meta is None:
+                        start = "int8" if col in text else str(_storage_dtype(schema[col])) if col in schema else str(s.dtype)
+                        meta = columns[col] = {"file": f"{len(columns)}.bin", "dtype": start}
+                        if col in text:
+                            meta["categories"] = []
+                            lookup[col] = {}
+                        files[col] = open(os.path.join(out_dir, meta["file"]), "wb")
+                    if "categories" in meta:
+                        cats, index = meta["categories"], lookup[col]
+                        for value in pd.unique(s.dropna()):
+                            if value not in index:
+                                index[value] = len(cats)
+                                cats.append(value)
+                        a = np.asarray(pd.Categorical(s, categories=cats).codes)
+                    elif pdt.is_numeric_dtype(s.dtype) or pdt.is_bool_dtype(s.dtype):
+                        a = s.to_numpy()
+                    else:
+                        raise _TextColumn(col)
+                    if a.dtype.kind in "iu" and len(a):
+                        lowest[col] = min(lowest.get(col, 0), a.min())
+                    cur = np.dtype(meta["dtype"])
+                    new = _widen(cur, _fitting_dtype(a), lowest.get(col, 0))
+                    if new != cur:
+                        # widen what was written so far; rare when the sample is representative
+                        files[col].close()
+                        fpath = os.path.join(out_dir, meta["file"])
+                        np.fromfile(fpath, dtype=cur).astype(new).tofile(fpath)
+                        files[col] = open(fpath, "ab")
+                        meta["dtype"] = new.str
+                    files[col].write(np.ascontiguousarray(a, dtype=new).tobytes())
+                rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+    for meta in columns.values():
+        meta["dtype"] = np.dtype(meta["dtype"]).str
+    return {"rows": rows, "columns": columns}
+
+
+def build_columnar_cache(
+    path: str,
+    cache_dir: Optional[str] = None,
+    schema: Optional[Dict[str, str]] = None,
+    chunksize: int = 200_000,
+    sample_rows: int = 100_000,
+) -> str:
+    """Convert a CSV once into one raw binary file per column; return the cache directory.
+
+    Layout of `cache_dir` (default: <csv>.columns):
+        manifest.json   source mtime/size and schema argument, row count,
+                        per-column dtype and categories for string columns
+        <i>.bin         column i, C-contiguous values (np.memmap-able)
+
+    Without a schema one is inferred from the first `sample_rows` rows; the
+    sample also decides which columns are text. Numbers are stored in the
+    schema's dtype; a chunk that does not fit (larger ints, non-float32
+    floats, NaN in an int column) widens that column, rewriting only the
+    file written so far. Strings are dictionary-encoded: int codes on disk
+    (-1 = missing), categories in the manifest. A column that looked numeric
+    but holds text further down restarts the conversion with that column
+    read as text. The directory is built under a temporary name and renamed
+    into place, so readers never see a half-written cache. Does nothing if
+    the cache matches the CSV's mtime and size and the same `schema`.
+    """
+    try:
+        import pandas as pd  # type: ignore
+        from pandas.api import types as pdt  # type: ignore
+    except Exception:
+        raise ImportError("numpy and pandas are required for build_columnar_cache")
+
+    cache_dir = cache_dir or _default_cache_dir(path)
+    key = _csv_cache_key(path, schema)
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f)["source"] == key:
+                return cache_dir
+
+    if schema is None:
+        sample = pd.read_csv(path, nrows=sample_rows)
+        used = infer_dtype_schema(sample)
+        text = {col for col in sample.columns if not (pdt.is_numeric_dtype(sample[col].dtype) or pdt.is_bool_dtype(sample[col].dtype))}
+        del sample
+    else:
+        used = schema
+        text = {col for col, spec in schema.items() if spec == "category"}
+    parent = os.path.dirname(os.path.abspath(cache_dir))
+    tmp = tempfile.mkdtemp(dir=parent, prefix=".tmp-columns-")
+    try:
+        while True:
+            try:
+                manifest = _write_columns(path, tmp, used, text, chunksize)
+                break
+            except _TextColumn as e:
+                text.add(e.column)
+                for name in os.listdir(tmp):
+                    os.remove(os.path.join(tmp, name))
+        manifest["source"] = key
+        with open(os.path.join(tmp, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(tmp, cache_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return cache_dir
+
+
+def load_csv_columns(
+    path: str,
+    columns: Optional[List[str]] = None,
+    cache_dir: Optional[str] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Return {column: array} for the requested columns, building the cache if stale.
+
+    Numeric columns are read-only np.memmap views (zero-copy; pages load on
+    first touch). String columns come back as pandas.Categorical built from
+    memmapped codes. `schema` is passed to build_columnar_cache and is part
+    of the cache key.
+    """
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        raise ImportError("numpy is required for load_csv_columns")
+
+    cache_dir = build_columnar_cache(path, cache_dir, schema)
+    with open(os.path.join(cache_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    out: Dict[str, Any] = {}
+    for col in columns if columns is not None else list(manifest["columns"]):
+        meta = manifest["columns"][col]
+        fpath = os.path.join(cache_dir, meta["file"])
+        if manifest["rows"] == 0:
+            arr = np.empty(0, dtype=meta["dtype"])
+        else:
+            arr = np.memmap(fpath, dtype=meta["dtype"], mode="r", shape=(manifest["rows"],))
+        if "categories" in meta:
+            import pandas as pd  # type: ignore
+
+            arr = pd.Categorical.from_codes(arr, categories=meta["categories"])
+        out[col] = arr
+    return out
+
+
+def cached_csv_column_sums(
+    path: str,
+    columns: Optional[List[str]] = None,
+    cache_dir: Optional[str] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> Dict[str, float]:
+    """chunked_csv_sum over the columnar cache: NaN-skipping sums at memory bandwidth."""
+    import numpy as np  # type: ignore
+
+    sums: Dict[str, float] = {}
+    for col, arr in load_csv_columns(path, columns, cache_dir, schema).items():
+        if isinstance(arr, np.ndarray):
+            sums[col] = float(np.nansum(arr, dtype="float64")) if arr.dtype.kind == "f" else float(arr.sum(dtype="float64"))
+    return sums
 
 
 def numpy_memmap_example(path: str, shape: Tuple[int, ...], dtype: str = "float32") -> None:
@@ -51,7 +656,168 @@ def numpy_memmap_example(path: str, shape: Tuple[int, ...], dtype: str = "float3
     _ = float(mm2[0])
 
 
+def _map_chunk(path: str, dtype: str, shape: Tuple[int, ...], fn: Callable[[Any], Any]) -> Any:
+    import numpy as np  # type: ignore
+
+    return fn(np.memmap(path, dtype=dtype, mode="r", shape=shape))
+
+
+class ChunkedArrayStore:
+    """On-disk array of rows, split into fixed-size memmapped chunk files.
+
+    Layout of `directory`:
+        meta.json            {"dtype", "row_shape", "chunk_rows", "length"}
+        chunk-000000.bin     chunk_rows rows, raw C-order bytes
+        ...
+
+    Chunk files are preallocated to full size, so append() only writes the
+    new rows (into the tail chunk, then fresh chunks) and rewrites meta.json
+    atomically; existing data is never copied. Indexing maps only the chunks
+    it touches: a slice inside one chunk is a zero-copy view, a slice that
+    crosses chunks is assembled into a new array. map_chunks() hands each
+    chunk to a worker process as a read-only memmap, so workers share the
+    page cache instead of receiving pickled copies.
+    """
+
+    META = "meta.json"
+
+    def __init__(self, directory: str, mode: str = "r") -> None:
+        import numpy as np  # type: ignore
+
+        if mode not in ("r", "r+"):
+            raise ValueError("mode must be 'r' or 'r+'")
+        with open(os.path.join(directory, self.META)) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.mode = mode
+        self.dtype = np.dtype(meta["dtype"])
+        self.row_shape: Tuple[int, ...] = tuple(meta["row_shape"])
+        self.chunk_rows: int = meta["chunk_rows"]
+        self._length: int = meta["length"]
+        self._maps: dict = {}
+
+    @classmethod
+    def create(cls, directory: str, dtype: Any, row_shape: Tuple[int, ...] = (), chunk_rows: int = 65536) -> "ChunkedArrayStore":
+        import numpy as np  # type: ignore
+
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, cls.META)):
+            raise FileExistsError(f"store already exists in {directory}")
+        store = cls.__new__(cls)
+        store.directory, store.mode = directory, "r+"
+        store.dtype, store.row_shape, store.chunk_rows = np.dtype(dtype), tuple(row_shape), chunk_rows
+        store._length, store._maps = 0, {}
+        store._write_meta()
+        return store
+
+    def _write_meta(self) -> None:
+        meta = {"dtype": self.dtype.str, "row_shape": list(self.row_shape), "chunk_rows": self.chunk_rows, "length": self._length}
+
+        def write(tmp: str) -> None:
+            with open(tmp, "w") as f:
+                json.dump(meta, f)
+
+        _atomic_write(os.path.join(self.directory, self.META), write)
+
+    def _chunk_path(self, i: int) -> str:
+        return os.path.join(self.directory, f"chunk-{i:06d}.bin")
+
+    def _chunk_map(self, i: int):
+        mm = self._maps.get(i)
+        if mm is None:
+            import numpy as np  # type: ignore
+
+            path = self._chunk_path(i)
+            shape = (self.chunk_rows,) + self.row_shape
+            mode = self.mode if os.path.exists(path) else "w+"
+            mm = self._maps[i] = np.memmap(path, dtype=self.dtype, mode=mode, shape=shape)
+        return mm
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (self._length,) + self.row_shape
+
+    @property
+    def n_chunks(self) -> int:
+        return -(-self._length // self.chunk_rows)
+
+    def chunk(self, i: int):
+        """Valid rows of chunk i as a memmap (read-only when opened with mode='r')."""
+        if not 0 <= i < self.n_chunks:
+            raise IndexError(i)
+        return self._chunk_map(i)[: min(self.chunk_rows, self._length - i * self.chunk_rows)]
+
+    def append(self, rows: Any) -> None:
+        import numpy as np  # type: ignore
+
+        if self.mode != "r+":
+            raise PermissionError("store opened read-only")
+        rows = np.asarray(rows, dtype=self.dtype)
+        if rows.shape[1:] != self.row_shape:
+            rows = rows.reshape((-1,) + self.row_shape)
+        pos = 0
+        while pos < len(rows):
+            ci, off = divmod(self._length, self.chunk_rows)
+            take = min(self.chunk_rows - off, len(rows) - pos)
+            mm = self._chunk_map(ci)
+            mm[off : off + take] = rows[pos : pos + take]
+            mm.flush()
+            self._length += take
+            pos += take
+        self._write_meta()
+
+    def __getitem__(self, key: Any):
+        import numpy as np  # type: ignore
+
+        rest: tuple = ()
+        if isinstance(key, tuple):
+            key, rest = key[0], key[1:]
+        if isinstance(key, (int, np.integer)):
+            idx = int(key) + (self._length if key < 0 else 0)
+            if not 0 <= idx < self._length:
+                raise IndexError(key)
+            ci, off = divmod(idx, self.chunk_rows)
+            out = self._chunk_map(ci)[off]
+        elif isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step <= 0:
+                raise IndexError("only positive slice steps are supported")
+            parts = []
+            i = start
+            while i < stop:
+                ci, off = divmod(i, self.chunk_rows)
+                end = min(stop, (ci + 1) * self.chunk_rows)
+                parts.append(self._chunk_map(ci)[off : end - ci * self.chunk_rows : step])
+                i += -(-(end - i) // step) * step  # first index >= end on the step grid
+            if not parts:
+                out = np.empty((0,) + self.row_shape, dtype=self.dtype)
+            else:
+                out = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        else:
+            raise TypeError(f"unsupported index {key!r}")
+        if rest and isinstance(key, slice):
+            rest = (slice(None),) + rest
+        return out[rest] if rest else out
+
+    def map_chunks(self, fn: Callable[[Any], Any], workers: Optional[int] = None) -> List[Any]:
+        """Return [fn(chunk) for each chunk], run on `workers` processes (fn must be picklable)."""
+        for mm in self._maps.values():
+            mm.flush()
+        jobs = [(self._chunk_path(i), self.dtype.str, self.chunk(i).shape) for i in range(self.n_chunks)]
+        if workers == 1:
+            return [_map_chunk(path, dtype, shape, fn) for path, dtype, shape in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_map_chunk, path, dtype, shape, fn) for path, dtype, shape in jobs]
+            return [f.result() for f in futures]
+
+
 def generator_pipeline(source: Iterable[Any], transform) -> Iterable[Any]:
+    """Lazily apply `transform`; see 07-pipelines.Pipeline for multi-stage, concurrent pipelines."""
     for item in source:
         yield transform(item)
 
@@ -74,16 +840,214 @@ def sparse_matrix_example(values: List[Tuple[int, int, float]]):
     return coo.tocsr()
 
 
+def _fingerprint(obj: Any, h: "hashlib._Hash") -> None:
+    """Feed a stable description of obj into hash h (arrays/frames by content)."""
+    kind = type(obj).__module__ + "." + type(obj).__qualname__
+    h.update(kind.encode())
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        h.update(repr(obj).encode())
+    elif isinstance(obj, (list, tuple)):
+        h.update(str(len(obj)).encode())
+        for item in obj:
+            _fingerprint(item, h)
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=repr):
+            _fingerprint(k, h)
+            _fingerprint(obj[k], h)
+    elif kind.startswith("numpy.") and hasattr(obj, "dtype") and hasattr(obj, "shape"):
+        import numpy as np  # type: ignore
+
+        h.update(f"{obj.dtype.str}{obj.shape}".encode())
+        if obj.dtype.hasobject:
+            # raw bytes would be PyObject pointers: hash the objects themselves
+            h.update(pickle.dumps(np.asarray(obj).tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+        elif obj.dtype.kind in "Mm":
+            # datetime64/timedelta64 cannot be exported as a buffer; the unit is in dtype.str
+            h.update(memoryview(np.ascontiguousarray(obj).view("i8")).cast("B"))
+        else:
+            h.update(memoryview(np.ascontiguousarray(obj)).cast("B"))
+    elif kind.startswith("pandas."):
+        import pandas as pd  # type: ignore
+
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode() + repr(list(map(str, obj.dtypes))).encode())
+            h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        elif isinstance(obj, pd.Series):
+            h.update(repr((obj.name, str(obj.dtype))).encode())
+            h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        elif isinstance(obj, pd.Index):
+            h.update(repr((obj.name, str(obj.dtype))).encode())
+            h.update(pd.util.hash_pandas_object(obj).values.tobytes())
+        else:
+            h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    else:
+        h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _code_fingerprint(code: Any, h: "hashlib._Hash") -> None:
+    """Feed bytecode and constants into h, recursing into nested code objects
+    (comprehensions, lambdas, inner defs), whose repr embeds a memory address."""
+    h.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_fingerprint(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+def _atomic_write(path: str, write: Callable[[str], None]) -> None:
+    """write(tmp_path) then os.replace: readers never observe a partial file."""
+    d = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _store(result: Any, base: str) -> str:
+    """Save result next to base: .npy for ndarrays, .parquet for DataFrames
+    (when pyarrow is available), .pkl otherwise. Returns the written path."""
+    kind = type(result).__module__
+    if kind.startswith("numpy") and type(result).__name__ == "ndarray" and result.dtype != object:
+        import numpy as np  # type: ignore
+
+        path = base + ".npy"
+
+        def write(tmp: str) -> None:
+            with open(tmp, "wb") as f:
+                np.save(f, result)
+
+        _atomic_write(path, write)
+        return path
+    if kind.startswith("pandas") and type(result).__name__ == "DataFrame":
+        try:
+            import pyarrow  # type: ignore  # noqa: F401
+
+            path = base + ".parquet"
+            _atomic_write(path, lambda tmp: result.to_parquet(tmp))
+            return path
+        except ImportError:
+            pass
+    path = base + ".pkl"
+
+    def write_pickle(tmp: str) -> None:
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    _atomic_write(path, write_pickle)
+    return path
+
+
+def _load(path: str, mmap: bool) -> Any:
+    if path.endswith(".npy"):
+        import numpy as np  # type: ignore
+
+        return np.load(path, mmap_mode="r" if mmap else None)
+    if path.endswith(".parquet"):
+        import pandas as pd  # type: ignore
+
+        return pd.read_parquet(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _enforce_size_cap(cache_dir: str, max_bytes: int) -> None:
+    """Delete least recently used entries (by mtime, refreshed on hits) until under max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.startswith(".tmp-"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:  # removed by another worker
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def disk_cache(cache_dir: str, max_bytes: Optional[int] = None, mmap: bool = True):
+    """Content-addressed on-disk memoization for expensive pipeline steps.
+
+    - key: sha256 over the function identity (module, qualname, bytecode and
+      constants, so editing the function invalidates old entries) and the
+      arguments; ndarrays and DataFrames are fingerprinted by content.
+    - storage: ndarray -> .npy, loaded back with mmap_mode="r" (zero-copy,
+      read-only); DataFrame -> Parquet when pyarrow is available; anything
+      else -> pickle. With mmap=True a miss also returns the stored
+      read-only memmap, so callers see the same type on hits and misses.
+    - writes go to a temp file in cache_dir and are published with os.replace,
+      so concurrent workers never read half-written entries.
+    - max_bytes: after each write, least recently used entries (file mtime,
+      touched on every hit) are deleted until the directory fits.
+    The wrapper exposes cache_dir and cache_clear().
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        code = getattr(fn, "__code__", None)
+        ident = hashlib.sha256()
+        ident.update(f"{fn.__module__}.{fn.__qualname__}".encode())
+        if code is not None:
+            _code_fingerprint(code, ident)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            h = ident.copy()
+            _fingerprint((args, kwargs), h)
+            base = os.path.join(cache_dir, h.hexdigest())
+            for ext in (".npy", ".parquet", ".pkl"):
+                path = base + ext
+                if os.path.exists(path):
+                    try:
+                        os.utime(path)  # mark as recently used for the LRU cap
+                        return _load(path, mmap)
+                    except FileNotFoundError:  # evicted between exists() and load
+                        break
+            result = fn(*args, **kwargs)
+            path = _store(result, base)
+            if mmap and path.endswith(".npy"):
+                result = _load(path, mmap)  # mapped before any eviction below, so it stays valid
+            if max_bytes is not None:
+                _enforce_size_cap(cache_dir, max_bytes)
+            return result
+
+        def cache_clear() -> None:
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+
+        wrapper.cache_dir = cache_dir  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return deco
+
+
 def ml_memory_tips() -> List[str]:
     return [
         "Prefer float32/int32 over float64/int64 when precision permits.",
         "Chunk large reads; avoid loading entire datasets into RAM.",
         "Use generators/iterators for streaming pipelines.",
-        "Leverage numpy.memmap for large arrays.",
+        "Leverage numpy.memmap for large arrays (ChunkedArrayStore for appendable, larger-than-RAM matrices).",
         "Use sparse matrices for high-dimensional sparse data.",
         "Avoid unnecessary copies; watch chained ops.",
         "Downcast to pandas.Categorical for low-cardinality strings.",
-        "Cache intermediates to disk when recomputation is expensive.",
+        "Convert CSVs read repeatedly into a columnar binary cache (build_columnar_cache) and memmap only the needed columns.",
+        "Reuse an inferred dtype schema (infer_dtype_schema) as read_csv(dtype=...) instead of downcasting every chunk.",
+        "Cache intermediates to disk when recomputation is expensive (see disk_cache).",
     ]
 
 
@@ -91,3 +1055,150 @@ if __name__ == "__main__":
     print("ML memory tips:")
     for tip in ml_memory_tips():
         print(" -", tip)
+
+    calls = []
+
+    @disk_cache(tempfile.mkdtemp(prefix="day1-cache-"), max_bytes=1 << 20)
+    def expensive(n: int, scale: float = 1.0):
+        calls.append(n)
+        return [i * scale for i in range(n)]
+
+    assert expensive(5) == expensive(5) == [0.0, 1.0, 2.0, 3.0, 4.0] and calls == [5]
+    expensive(5, scale=2.0)
+    assert calls == [5, 5]
+    expensive.cache_clear()
+
+    try:
+        import numpy as np  # type: ignore
+
+        @disk_cache(tempfile.mkdtemp(prefix="day1-cache-"))
+        def doubled(a):
+            return a * 2
+
+        first, again = doubled(np.arange(3)), doubled(np.arange(3))
+        assert type(first) is type(again) and not first.flags.writeable and list(again) == [0, 2, 4]
+        def key(obj: Any) -> str:
+            h = hashlib.sha256()
+            _fingerprint(obj, h)
+            return h.hexdigest()
+
+        assert key(np.array(["a", 1], dtype=object)) == key(np.array(["a", 1], dtype=object))
+        assert key(np.array(["2024-01-01"], dtype="datetime64[D]")) != key(np.array(["2024-01-02"], dtype="datetime64[D]"))
+        import pandas as pd  # type: ignore
+
+        assert key(pd.Series([1, 2])) != key(pd.Series([1, 3])) and key(pd.Index([1])) == key(pd.Index([1]))
+    except ImportError:
+        pass
+    # the key must not depend on the process: a function holding a comprehension
+    # computed in one interpreter is a hit in the next
+    shared = tempfile.mkdtemp(prefix="day1-cache-")
+    script = (
+        "import importlib.util, os, sys\n"
+        "spec = importlib.util.spec_from_file_location('ml_memory', sys.argv[1])\n"
+        "m = importlib.util.module_from_spec(spec); spec.loader.exec_module(m)\n"
+        "calls = []\n"
+        "@m.disk_cache(sys.argv[2])\n"
+        "def squares(n):\n"
+        "    calls.append(n)\n"
+        "    return [i * i for i in range(n)]\n"
+        "assert squares(4) == [0, 1, 4, 9]\n"
+        "print('miss' if calls else 'hit')\n"
+    )
+    runs = [
+        subprocess.run([sys.executable, "-c", script, os.path.abspath(__file__), shared], capture_output=True, text=True, check=True).stdout.strip()
+        for _ in range(2)
+    ]
+    assert runs == ["miss", "hit"], runs
+    shutil.rmtree(shared)
+    print("disk_cache: PASS")
+
+    try:
+        import numpy as np  # type: ignore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ChunkedArrayStore.create(os.path.join(tmp, "features"), "float32", row_shape=(3,), chunk_rows=100)
+            data = np.arange(750 * 3, dtype="float32").reshape(750, 3)
+            store.append(data[:130])
+            store.append(data[130:])
+            store = ChunkedArrayStore(store.directory)
+            assert store.shape == (750, 3) and store.n_chunks == 8
+            assert np.array_equal(store[95:405:7], data[95:405:7]) and np.array_equal(store[-1], data[-1])
+            assert np.array_equal(store[90:110, 1], data[90:110, 1])
+            sums = store.map_chunks(np.sum, workers=2)
+            assert float(sum(sums)) == float(data.sum())
+        print("ChunkedArrayStore: PASS")
+    except ImportError as e:
+        print("(skip) numpy not available:", e)
+
+    try:
+        import numpy as np  # type: ignore
+        import pandas as pd  # type: ignore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "data.csv")
+            pd.DataFrame({"a": range(1000), "b": [0.5] * 1000}).to_csv(csv_path, index=False)
+            chunks = list(parallel_read_csv(csv_path, workers=2, chunk_bytes=1024))
+            assert len(chunks) > 1 and sum(len(c) for c in chunks) == 1000
+            assert list(pd.concat(chunks)["a"]) == list(range(1000))
+            assert list(pd.concat(chunks).index) == list(range(1000))
+            semi_path = os.path.join(tmp, "semi.csv")
+            pd.DataFrame({"a": range(10), "b": range(10, 20)}).to_csv(semi_path, index=False, sep=";")
+            assert parallel_csv_column_sums(semi_path, workers=2, chunk_bytes=16, sep=";") == {"a": 45.0, "b": 145.0}
+            sums = parallel_csv_column_sums(csv_path, workers=2, chunk_bytes=1024)
+            assert sums == {"a": 499500.0, "b": 500.0}
+        print("parallel CSV reader: PASS")
+
+        df = pd.DataFrame({
+            "id": range(1000),
+            "color": ["red", "green", "blue", "red"] * 250,
+            "count": [1.0, None] * 500,
+            "rare": [0.0] * 990 + [2.5] * 10,
+        })
+        schema = infer_dtype_schema(df)
+        assert schema == {"id": "int16", "color": "category", "count": "Int8", "rare": "Sparse[float32, 0.0]"}
+        before = df.memory_usage(deep=True).sum()
+        small = pandas_downcast_df(df, schema=schema)
+        assert df["id"].dtype == "int64" and small.memory_usage(deep=True).sum() < before / 4
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "typed.csv")
+            df.to_csv(csv_path, index=False)
+            chunk = next(iter(read_csv_in_chunks(csv_path, chunksize=400, schema=schema)))
+            assert {col: str(dt) for col, dt in chunk.dtypes.items()} == schema
+            # values outside the sampled schema widen instead of wrapping
+            chunk = next(iter(read_csv_in_chunks(csv_path, chunksize=400, schema={"id": "int8"})))
+            assert chunk["id"].dtype == "int16" and int(chunk["id"].max()) == 399
+        u = pd.DataFrame({"big": np.array([2**63 + 5, 1], dtype="uint64"), "small": np.array([1, 2], dtype="uint8")})
+        assert infer_dtype_schema(u) == {} and int(pandas_downcast_df(u)["big"][0]) == 2**63 + 5
+        # float32 only when lossless, also for the fallback of a schema that does not fit
+        f = pd.DataFrame({"exact": [0.5, 1.25, 3.0], "inexact": [0.1, 0.2, 123456.789]})
+        assert infer_dtype_schema(f) == {"exact": "float32"}
+        assert pandas_downcast_df(f, schema={"exact": "float32", "inexact": "float32"})["inexact"].tolist() == [0.1, 0.2, 123456.789]
+        print("dtype schema: PASS")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "wide.csv")
+            pd.DataFrame({
+                "a": list(range(999)) + [100_000],  # outgrows the sampled int16
+                "b": [0.25, None] * 500,
+                "c": ["x", "y", None, "z"] * 250,
+            }).to_csv(csv_path, index=False)
+            cache_dir = build_columnar_cache(csv_path, sample_rows=100, chunksize=300)
+            cols = load_csv_columns(csv_path, ["a", "c"])
+            assert cols["a"].dtype == "int32" and int(cols["a"][-1]) == 100_000
+            assert list(cols["c"].codes[:4]) == [0, 1, -1, 2] and list(cols["c"].categories) == ["x", "y", "z"]
+            assert cached_csv_column_sums(csv_path, ["a", "b"]) == {"a": float(sum(range(999)) + 100_000), "b": 125.0}
+            stamp = os.stat(os.path.join(cache_dir, "manifest.json")).st_mtime_ns
+            build_columnar_cache(csv_path)
+            assert os.stat(os.path.join(cache_dir, "manifest.json")).st_mtime_ns == stamp  # cache hit
+            assert load_csv_columns(csv_path, ["a"], schema={"a": "int64"})["a"].dtype == "int64"  # new schema, new cache
+
+            ids_path = os.path.join(tmp, "ids.csv")
+            with open(ids_path, "w") as f:
+                f.write("id,n\n" + "".join(f"{i},{2**63 + i}\n" for i in range(500)) + "abc,1\n")
+            build_columnar_cache(ids_path, sample_rows=100, chunksize=100)
+            cols = load_csv_columns(ids_path)
+            assert cols["id"][-1] == "abc" and cols["id"][0] == "0"
+            assert cols["n"].dtype == "uint64" and int(cols["n"][3]) == 2**63 + 3
+        print("columnar CSV cache: PASS")
+    except ImportError as e:
+        print("(skip) pandas not available:", e)
@@ -0,0 +1,525 @@
+"""
+05-benchmarks: Shared benchmark harness (registry + CLI) for the Day1 modules.
+
+Any Day1 module (including solutions/) that defines
+
+    benchmark_cases(n: int) -> Dict[str, Callable[[], Any]]
+
+is discovered automatically. Each zero-arg callable is one operation; setup
+happens in benchmark_cases so only the operation itself is timed.
+
+For every case the runner does (see Day1/THEORY.md §8 on methodology):
+- warmup calls (not recorded)
+- repeated trials with gc disabled, timed with time.perf_counter
+- median / p95 / mean / stddev / min over the trial samples
+- a separate tracemalloc run for peak allocated bytes (tracing slows timing)
+
+Results can be written as JSON (with raw samples and machine metadata) or CSV.
+
+Regression tracking: --save-baseline stores the trial samples in a baseline file
+keyed by a machine fingerprint (hardware + OS + Python version). --compare runs
+a one-sided Mann-Whitney U test per operation against that baseline and exits
+with status 1 if any operation's median slowed by more than --threshold and the
+slowdown is significant at --alpha.
+
+Complexity fitting: --fit times each case over a geometric sweep of n, fits
+log(t) against candidate models (O(1), O(log n), O(n), O(n log n), O(n^2)),
+reports the log-log exponent with a 95% interval, and checks each module's
+BENCHMARK_COMPLEXITY claim (e.g. derived from BIG_O_NOTES): "ok" when the
+claimed model fits best, "MISMATCH" (exit status 1) only when the claimed
+model's exponent lies outside the interval and the best fit beats the
+runner-up by more than --min-margin, "inconclusive" otherwise.
+
+Usage:
+    python Day1/05-benchmarks.py --fit --filter containers --min-n 1000 --max-n 16000
+    python Day1/05-benchmarks.py --sizes 1000 5000 --trials 7 --json out.json
+    python Day1/05-benchmarks.py --filter two-sum --csv out.csv
+    python Day1/05-benchmarks.py --trials 15 --save-baseline baseline.json
+    python Day1/05-benchmarks.py --trials 15 --compare baseline.json --threshold 0.10
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import argparse
+import csv
+import gc
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+DAY1_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CaseFactory = Callable[[int], Dict[str, Callable[[], Any]]]
+
+# module name -> benchmark_cases factory; filled by discover_benchmarks or register
+REGISTRY: Dict[str, CaseFactory] = {}
+# module name -> {case: "O(...)"} expected total cost of one call, from BENCHMARK_COMPLEXITY
+CLAIMS: Dict[str, Dict[str, str]] = {}
+
+
+def register(name: str, complexity: Optional[Dict[str, str]] = None):
+    """Decorator to register an extra case factory under `name`."""
+    def deco(factory: CaseFactory) -> CaseFactory:
+        REGISTRY[name] = factory
+        if complexity:
+            CLAIMS[name] = dict(complexity)
+        return factory
+    return deco
+
+
+def load_day1_module(path: str):
+    """Import a Day1 file by path (the numbered names are not valid identifiers)."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # lets process pools pickle module-level workers
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover_benchmarks(root: str = DAY1_DIR) -> Dict[str, CaseFactory]:
+    """Register benchmark_cases from every .py under root and root/solutions."""
+    this = os.path.abspath(__file__)
+    for folder in (root, os.path.join(root, "solutions")):
+        if not os.path.isdir(folder):
+            continue
+        for fname in sorted(os.listdir(folder)):
+            path = os.path.join(folder, fname)
+            if not fname.endswith(".py") or os.path.abspath(path) == this:
+                continue
+            module = load_day1_module(path)
+            factory = getattr(module, "benchmark_cases", None)
+            if callable(factory):
+                key = os.path.relpath(path, root)[: -len(".py")]
+                REGISTRY[key] = factory
+                CLAIMS[key] = dict(getattr(module, "BENCHMARK_COMPLEXITY", {}))
+    return REGISTRY
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 100]."""
+    if not sorted_vals:
+        return float("nan")
+    pos = (len(sorted_vals) - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    s = sorted(samples)
+    return {
+        "median_s": statistics.median(s),
+        "p95_s": _percentile(s, 95.0),
+        "mean_s": statistics.fmean(s),
+        "stddev_s": statistics.stdev(s) if len(s) > 1 else 0.0,
+        "min_s": s[0],
+    }
+
+
+def run_case(fn: Callable[[], Any], warmup: int = 1, trials: int = 5, measure_memory: bool = True) -> Dict[str, Any]:
+    """Time one zero-arg callable; returns samples, summary stats and peak bytes."""
+    for _ in range(warmup):
+        fn()
+
+    samples: List[float] = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(trials):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    row: Dict[str, Any] = {"trials": trials, **summarize(samples), "samples": samples}
+    row["peak_bytes"] = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            fn()
+            row["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return row
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = (1000,),
+    warmup: int = 1,
+    trials: int = 5,
+    name_filter: Optional[str] = None,
+    measure_memory: bool = True,
+) -> List[Dict[str, Any]]:
+    """Run every registered case at every size; one result row per (module, case, n)."""
+    if not REGISTRY:
+        discover_benchmarks()
+    results: List[Dict[str, Any]] = []
+    for module in sorted(REGISTRY):
+        for n in sizes:
+            for case, fn in REGISTRY[module](n).items():
+                full = f"{module}:{case}"
+                if name_filter and name_filter not in full:
+                    continue
+                row = {"module": module, "case": case, "n": n}
+                row.update(run_case(fn, warmup=warmup, trials=trials, measure_memory=measure_memory))
+                results.append(row)
+    return results
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def machine_fingerprint(info: Optional[Dict[str, str]] = None) -> str:
+    """Short stable id for (hardware, OS, Python); baselines are only compared within one."""
+    info = info or machine_info()
+    blob = json.dumps(info, sort_keys=True).encode()
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def _result_key(row: Dict[str, Any]) -> str:
+    return f"{row['module']}:{row['case']}:n={row['n']}"
+
+
+def load_baselines(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"baselines": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[Dict[str, Any]], path: str) -> str:
+    """Store samples for this machine in the baseline file (other machines kept)."""
+    data = load_baselines(path)
+    fp = machine_fingerprint()
+    data["baselines"][fp] = {
+        "created": time.time(),
+        "machine": machine_info(),
+        "results": {
+            _result_key(r): {"median_s": r["median_s"], "samples": r["samples"]} for r in results
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return fp
+
+
+def mann_whitney_u(current: List[float], baseline: List[float]) -> Dict[str, float]:
+    """One-sided Mann-Whitney U test that `current` tends to be larger (slower).
+
+    Uses average ranks for ties and the normal approximation with tie and
+    continuity correction; adequate from ~5 samples per side. Returns U and p.
+    """
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return {"u": float("nan"), "p": 1.0}
+    pooled = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        avg = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            ranks[k] = avg
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    r1 = sum(r for r, (_, grp) in zip(ranks, pooled) if grp == 0)
+    u = r1 - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    mu = n1 * n2 / 2.0
+    var = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var <= 0:
+        return {"u": u, "p": 1.0 if u <= mu else 0.0}
+    z = (u - mu - 0.5) / math.sqrt(var)
+    p = 0.5 * math.erfc(z / math.sqrt(2.0))
+    return {"u": u, "p": p}
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    threshold: float = 0.10,
+    alpha: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """Per-operation deltas vs baseline; status is regressed/improved/ok/new."""
+    stored = baseline.get("results", {})
+    rows: List[Dict[str, Any]] = []
+    for r in results:
+        key = _result_key(r)
+        base = stored.get(key)
+        row: Dict[str, Any] = {"key": key, "current_s": r["median_s"]}
+        if base is None:
+            row.update(baseline_s=None, delta_pct=None, p=None, status="new")
+            rows.append(row)
+            continue
+        delta = (r["median_s"] - base["median_s"]) / base["median_s"] if base["median_s"] > 0 else 0.0
+        p = mann_whitney_u(r["samples"], base["samples"])["p"]
+        if delta > threshold and p < alpha:
+            status = "regressed"
+        elif delta < -threshold and mann_whitney_u(base["samples"], r["samples"])["p"] < alpha:
+            status = "improved"
+        else:
+            status = "ok"
+        row.update(baseline_s=base["median_s"], delta_pct=delta * 100.0, p=p, status=status)
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':52s} {'baseline':>11s} {'current':>11s} {'delta':>9s} {'p':>7s}  status")
+    for r in rows:
+        if r["baseline_s"] is None:
+            print(f"{r['key']:52s} {'-':>11s} {r['current_s']:11.6f} {'-':>9s} {'-':>7s}  {r['status']}")
+            continue
+        print(
+            f"{r['key']:52s} {r['baseline_s']:11.6f} {r['current_s']:11.6f} "
+            f"{r['delta_pct']:+8.1f}% {r['p']:7.4f}  {r['status']}"
+        )
+
+
+COMPLEXITY_MODELS: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n * n,
+}
+
+# two-sided 95% Student t quantiles by degrees of freedom (normal beyond 10)
+_T95 = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31, 9: 2.26, 10: 2.23}
+
+
+# a best fit must beat the runner-up score by this factor before a claim counts as wrong
+MISMATCH_MIN_MARGIN = 1.5
+
+
+def model_exponent(model: str, sizes: List[int]) -> float:
+    """Log-log slope of COMPLEXITY_MODELS[model] over `sizes` (e.g. ~0.12 for
+    O(log n) over 1e3..1.6e4), comparable to fit_complexity's exponent."""
+    f = COMPLEXITY_MODELS[model]
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(f(n)) for n in sizes]
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def claim_status(fit: Dict[str, Any], expected: Optional[str], sizes: List[int], min_margin: float = MISMATCH_MIN_MARGIN) -> str:
+    """'ok' / 'MISMATCH' / 'inconclusive' ('-' without a claim) for one fit.
+
+    A noisy sweep often ranks a neighbouring model first by a hair, so a
+    different best fit alone is not evidence: the claim is rejected only if
+    its exponent is outside the 95% interval and the fit is decisive.
+    """
+    if expected is None:
+        return "-"
+    if expected == fit["best"]:
+        return "ok"
+    lo, hi = fit["exponent_ci"]
+    if not lo <= model_exponent(expected, sizes) <= hi and fit["margin"] > min_margin:
+        return "MISMATCH"
+    return "inconclusive"
+
+
+def normalize_big_o(claim: str) -> str:
+    """'O(n²)' / 'O(n^2) avg' / 'O(1) amortized' -> key of COMPLEXITY_MODELS."""
+    inner = claim.replace("²", "^2").replace("*", " ").split("(", 1)[-1].split(")")[0]
+    return f"O({' '.join(inner.split())})"
+
+
+def geometric_sizes(n_min: int, n_max: int, points: int) -> List[int]:
+    if points < 2 or n_min <= 1 or n_max <= n_min:
+        raise ValueError("need points >= 2 and 1 < n_min < n_max")
+    ratio = (n_max / n_min) ** (1.0 / (points - 1))
+    return sorted({int(round(n_min * ratio ** k)) for k in range(points)})
+
+
+def fit_complexity(sizes: List[int], times: List[float]) -> Dict[str, Any]:
+    """Fit measured times against COMPLEXITY_MODELS.
+
+    - exponent: slope of log t vs log n (least squares) with a 95% interval
+    - model scores: for t ~ c * f(n), log t - log f(n) should be constant; the
+      score is the std dev of that residual (scale-free, lower is better)
+    - margin: runner-up score / best score (>1; larger = more decisive)
+    """
+    if len(sizes) != len(times) or len(sizes) < 3:
+        raise ValueError("need at least 3 (size, time) points")
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-12)) for t in times]
+    k = len(xs)
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+    intercept = my - slope * mx
+    sse = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys))
+    se = math.sqrt(sse / (k - 2) / sxx) if k > 2 else float("inf")
+    half = _T95.get(k - 2, 1.96) * se
+
+    scores: Dict[str, float] = {}
+    for name, f in COMPLEXITY_MODELS.items():
+        resid = [y - math.log(f(n)) for n, y in zip(sizes, ys)]
+        scores[name] = statistics.pstdev(resid)
+    ranked = sorted(scores, key=scores.get)
+    best, second = ranked[0], ranked[1]
+    margin = scores[second] / scores[best] if scores[best] > 0 else float("inf")
+    return {
+        "exponent": slope,
+        "exponent_ci": (slope - half, slope + half),
+        "best": best,
+        "margin": margin,
+        "scores": scores,
+    }
+
+
+def complexity_sweep(
+    sizes: List[int],
+    warmup: int = 1,
+    trials: int = 3,
+    name_filter: Optional[str] = None,
+    min_margin: float = MISMATCH_MIN_MARGIN,
+) -> List[Dict[str, Any]]:
+    """Time every registered case over `sizes` and fit its scaling (median per size)."""
+    if not REGISTRY:
+        discover_benchmarks()
+    rows: List[Dict[str, Any]] = []
+    for module in sorted(REGISTRY):
+        per_case: Dict[str, List[float]] = {}
+        for n in sizes:
+            for case, fn in REGISTRY[module](n).items():
+                if name_filter and name_filter not in f"{module}:{case}":
+                    continue
+                stats = run_case(fn, warmup=warmup, trials=trials, measure_memory=False)
+                per_case.setdefault(case, []).append(stats["median_s"])
+        for case, times in per_case.items():
+            if len(times) != len(sizes):
+                continue  # case not offered at every size (e.g. brute force cut-off)
+            fit = fit_complexity(sizes, times)
+            claim = CLAIMS.get(module, {}).get(case)
+            expected = normalize_big_o(claim) if claim else None
+            fit.update(module=module, case=case, sizes=list(sizes), times=times, claim=expected)
+            fit["status"] = claim_status(fit, expected, sizes, min_margin)
+            rows.append(fit)
+    return rows
+
+
+def print_fits(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':40s} {'exponent (95% CI)':>24s} {'best fit':>11s} {'margin':>7s} {'claim':>11s}  status")
+    for r in rows:
+        lo, hi = r["exponent_ci"]
+        ci = f"{r['exponent']:.2f} [{lo:.2f}, {hi:.2f}]"
+        name = f"{r['module']}:{r['case']}"
+        print(f"{name:40s} {ci:>24s} {r['best']:>11s} {r['margin']:7.2f} {r['claim'] or '-':>11s}  {r['status']}")
+
+
+def write_json(results: List[Dict[str, Any]], path: str) -> None:
+    payload = {"created": time.time(), "machine": machine_info(), "results": results}
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+CSV_FIELDS = ["module", "case", "n", "trials", "median_s", "p95_s", "mean_s", "stddev_s", "min_s", "peak_bytes"]
+
+
+def write_csv(results: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(results)
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':45s} {'n':>7s} {'median':>11s} {'p95':>11s} {'stddev':>11s} {'peak KiB':>10s}")
+    for r in results:
+        peak = "-" if r["peak_bytes"] is None else f"{r['peak_bytes'] / 1024:.1f}"
+        name = f"{r['module']}:{r['case']}"
+        print(f"{name:45s} {r['n']:7d} {r['median_s']:11.6f} {r['p95_s']:11.6f} {r['stddev_s']:11.6f} {peak:>10s}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Run Day1 benchmarks with warmup, trials and stats.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000], help="input sizes n")
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--trials", type=int, default=5)
+    ap.add_argument("--filter", dest="name_filter", default=None, help="substring of 'module:case'")
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--json", dest="json_path", default=None, help="write results as JSON")
+    ap.add_argument("--csv", dest="csv_path", default=None, help="write results as CSV")
+    ap.add_argument("--list", action="store_true", help="list discovered cases and exit")
+    ap.add_argument("--fit", action="store_true", help="fit scaling over a geometric size sweep")
+    ap.add_argument("--min-n", type=int, default=1000)
+    ap.add_argument("--max-n", type=int, default=16000)
+    ap.add_argument("--points", type=int, default=5)
+    ap.add_argument("--min-margin", type=float, default=MISMATCH_MIN_MARGIN, help="fit margin needed before a claim is reported as a MISMATCH")
+    ap.add_argument("--save-baseline", default=None, help="store results as this machine's baseline")
+    ap.add_argument("--compare", default=None, help="compare against this machine's stored baseline")
+    ap.add_argument("--threshold", type=float, default=0.10, help="relative median slowdown that counts (0.10 = 10%%)")
+    ap.add_argument("--alpha", type=float, default=0.05, help="significance level for the Mann-Whitney test")
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    discover_benchmarks()
+    if args.list:
+        for module in sorted(REGISTRY):
+            for case in REGISTRY[module](args.sizes[0]):
+                print(f"{module}:{case}")
+        return 0
+
+    if args.fit:
+        sizes = geometric_sizes(args.min_n, args.max_n, args.points)
+        rows = complexity_sweep(sizes, args.warmup, args.trials, args.name_filter, args.min_margin)
+        print_fits(rows)
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"machine": machine_info(), "fits": rows}, f, indent=2)
+        return 1 if any(r["status"] == "MISMATCH" for r in rows) else 0
+
+    results = run_benchmarks(args.sizes, args.warmup, args.trials, args.name_filter, not args.no_memory)
+    print_table(results)
+    if args.json_path:
+        write_json(results, args.json_path)
+    if args.csv_path:
+        write_csv(results, args.csv_path)
+    if args.save_baseline:
+        fp = save_baseline(results, args.save_baseline)
+        print(f"Saved baseline for machine {fp} to {args.save_baseline}")
+    if args.compare:
+        fp = machine_fingerprint()
+        baseline = load_baselines(args.compare)["baselines"].get(fp)
+        if baseline is None:
+            print(f"No baseline for machine {fp} in {args.compare}; run with --save-baseline first.")
+            return 2
+        rows = compare_to_baseline(results, baseline, args.threshold, args.alpha)
+        print()
+        print_comparison(rows)
+        regressed = [r["key"] for r in rows if r["status"] == "regressed"]
+        if regressed:
+            print(f"\n{len(regressed)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,474 @@
+"""
+06-caches: Bounded in-memory caches built on the collections from 02-collections.
+
+Includes:
+- LRUCache: OrderedDict + move_to_end (the pattern shown in collections_examples)
+- LFUCache: O(1) least-frequently-used via per-frequency OrderedDict buckets
+- TTLCache: entries expire `ttl` seconds after being written
+- ThreadSafeCache: lock-guarded wrapper around any of the above
+- memoize: decorator form for expensive preprocessing steps
+
+Every cache is bounded by entry count (max_entries), estimated size in bytes
+(max_bytes, measured with `sizeof`, default sys.getsizeof), or both, and keeps
+hit / miss / eviction counters in `stats()`.
+
+benchmark_cases compares hit latency with functools.lru_cache
+(run Day1/05-benchmarks.py --filter caches).
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Optional
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import functools
+import sys
+import threading
+import time
+
+_MISSING = object()
+
+
+class _BoundedCache(ABC):
+    """Shared bookkeeping: bounds, byte accounting and counters.
+
+    Subclasses supply the eviction policy through get/put/pop/clear.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ) -> None:
+        if max_entries is None and max_bytes is None:
+            raise ValueError("set max_entries and/or max_bytes")
+        if (max_entries is not None and max_entries <= 0) or (max_bytes is not None and max_bytes <= 0):
+            raise ValueError("bounds must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._sizes: Dict[Hashable, int] = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _over(self) -> bool:
+        return (self.max_entries is not None and len(self._sizes) > self.max_entries) or (
+            self.max_bytes is not None and self.current_bytes > self.max_bytes
+        )
+
+    def _fits(self, value: Any) -> Optional[int]:
+        """Estimated size of value, or None if it alone exceeds max_bytes."""
+        if self.max_bytes is None:
+            return 0
+        size = self._sizeof(value)
+        return None if size > self.max_bytes else size
+
+    def _account(self, key: Hashable, size: int) -> None:
+        self.current_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _forget(self, key: Hashable) -> None:
+        self.current_bytes -= self._sizes.pop(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, _count=False) is not _MISSING
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self),
+            "bytes": self.current_bytes,
+        }
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None, _count: bool = True) -> Any:
+        """Return the cached value (updating recency/frequency) or default."""
+
+    @abstractmethod
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace key, evicting per policy to stay within bounds."""
+
+    @abstractmethod
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+
+
+class LRUCache(_BoundedCache):
+    """Least-recently-used eviction; get and put are O(1)."""
+
+    def __init__(self, max_entries: Optional[int] = 128, max_bytes: Optional[int] = None, sizeof=sys.getsizeof) -> None:
+        super().__init__(max_entries, max_bytes, sizeof)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None, _count: bool = True) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            if _count:
+                self.misses += 1
+            return default
+        if _count:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._fits(value)
+        if size is None:
+            self.pop(key)
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._account(key, size)
+        while self._over():
+            old, _ = self._data.popitem(last=False)
+            self._forget(old)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        self._forget(key)
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.current_bytes = 0
+
+
+class LFUCache(_BoundedCache):
+    """Least-frequently-used eviction in O(1) (ties broken by least recent use).
+
+    key -> [value, freq], plus freq -> OrderedDict of keys with that count.
+    min_freq tracks the lowest non-empty bucket; a new key always starts at 1.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 128, max_bytes: Optional[int] = None, sizeof=sys.getsizeof) -> None:
+        super().__init__(max_entries, max_bytes, sizeof)
+        self._data: Dict[Hashable, list] = {}
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_freq = 0
+
+    def _touch(self, key: Hashable, entry: list) -> None:
+        f = entry[1]
+        bucket = self._buckets[f]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[f]
+            if self._min_freq == f:
+                self._min_freq = f + 1
+        entry[1] = f + 1
+        self._buckets.setdefault(f + 1, OrderedDict())[key] = None
+
+    def get(self, key: Hashable, default: Any = None, _count: bool = True) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            if _count:
+                self.misses += 1
+            return default
+        if _count:
+            self.hits += 1
+            self._touch(key, entry)
+        return entry[0]
+
+    def _evict_one(self) -> None:
+        if self._min_freq not in self._buckets:
+            self._min_freq = min(self._buckets)
+        bucket = self._buckets[self._min_freq]
+        old, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[self._min_freq]
+        del self._data[old]
+        self._forget(old)
+        self.evictions += 1
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._fits(value)
+        if size is None:
+            self.pop(key)
+            return
+        entry = self._data.get(key)
+        if entry is not None:
+            entry[0] = value
+            self._touch(key, entry)
+        else:
+            # evict before inserting, or the new key (freq 1) would be the victim
+            while self._data and (
+                (self.max_entries is not None and len(self._data) + 1 > self.max_entries)
+                or (self.max_bytes is not None and self.current_bytes + size > self.max_bytes)
+            ):
+                self._evict_one()
+            self._data[key] = [value, 1]
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_freq = 1
+        self._account(key, size)
+        while self._over():
+            self._evict_one()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        bucket = self._buckets[entry[1]]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry[1]]
+        self._forget(key)
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._buckets.clear()
+        self._sizes.clear()
+        self.current_bytes = 0
+        self._min_freq = 0
+
+
+class TTLCache(_BoundedCache):
+    """Entries expire `ttl` seconds after their last put.
+
+    Because ttl is fixed, write order equals expiry order: an OrderedDict in
+    write order lets expired entries be purged from the front in O(1) each,
+    and the oldest write is evicted first when a bound is hit.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        sizeof=sys.getsizeof,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(max_entries, max_bytes, sizeof)
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (deadline, value)
+        self.expirations = 0
+
+    def _purge(self) -> None:
+        now = self._clock()
+        while self._data:
+            key, (deadline, _) = next(iter(self._data.items()))
+            if deadline > now:
+                break
+            del self._data[key]
+            self._forget(key)
+            self.expirations += 1
+
+    def get(self, key: Hashable, default: Any = None, _count: bool = True) -> Any:
+        self._purge()
+        item = self._data.get(key)
+        if item is None:
+            if _count:
+                self.misses += 1
+            return default
+        if _count:
+            self.hits += 1
+        return item[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._purge()
+        size = self._fits(value)
+        if size is None:
+            self.pop(key)
+            return
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        self._account(key, size)
+        while self._over():
+            old, _ = self._data.popitem(last=False)
+            self._forget(old)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        self._forget(key)
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        out = super().stats()
+        out["expirations"] = self.expirations
+        return out
+
+
+class ThreadSafeCache:
+    """Serialize every call to a wrapped cache with one lock.
+
+    Note that get updates recency/frequency state, so even reads must lock.
+    """
+
+    def __init__(self, cache: _BoundedCache) -> None:
+        self._cache = cache
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._cache.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._cache.put(key, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._cache.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return self._cache.stats()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._cache
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    if not kwargs and len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+    return args + ((_MISSING,) + tuple(sorted(kwargs.items())) if kwargs else ())
+
+
+def memoize(
+    cache: Optional[Any] = None,
+    maxsize: Optional[int] = 128,
+    max_bytes: Optional[int] = None,
+    policy: str = "lru",
+    ttl: Optional[float] = None,
+    thread_safe: bool = False,
+):
+    """Decorator caching results by call arguments (which must be hashable).
+
+    Pass a ready cache, or let policy ("lru" / "lfu" / "ttl") build one. The
+    wrapper exposes .cache for stats() and clear(). Unlike functools.lru_cache,
+    the cache can be bounded by bytes and can expire entries.
+    """
+    if cache is None:
+        if policy == "lru":
+            cache = LRUCache(maxsize, max_bytes)
+        elif policy == "lfu":
+            cache = LFUCache(maxsize, max_bytes)
+        elif policy == "ttl":
+            if ttl is None:
+                raise ValueError("policy='ttl' needs ttl")
+            cache = TTLCache(ttl, maxsize, max_bytes)
+        else:
+            raise ValueError(f"unknown policy {policy!r}")
+        if thread_safe:
+            cache = ThreadSafeCache(cache)
+
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(args, kwargs)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return deco
+
+
+def benchmark_cases(n: int = 20000) -> Dict[str, Callable[[], Any]]:
+    """n cache hits per call: functools.lru_cache vs each policy (decorated and direct).
+
+    Discovered by Day1/05-benchmarks.py.
+    """
+    keys = list(range(256)) * max(1, n // 256)
+
+    def square(x: int) -> int:
+        return x * x
+
+    std = functools.lru_cache(maxsize=512)(square)
+    lru = memoize(maxsize=512)(square)
+    lfu = memoize(maxsize=512, policy="lfu")(square)
+    ttl = memoize(maxsize=512, policy="ttl", ttl=3600.0)(square)
+    locked = memoize(maxsize=512, thread_safe=True)(square)
+    direct = LRUCache(512)
+    for fn in (std, lru, lfu, ttl, locked):
+        for k in range(256):
+            fn(k)
+    for k in range(256):
+        direct.put(k, k * k)
+
+    return {
+        "functools_lru_cache_hit": lambda: [std(k) for k in keys],
+        "memoize_lru_hit": lambda: [lru(k) for k in keys],
+        "memoize_lfu_hit": lambda: [lfu(k) for k in keys],
+        "memoize_ttl_hit": lambda: [ttl(k) for k in keys],
+        "memoize_lru_threadsafe_hit": lambda: [locked(k) for k in keys],
+        "LRUCache_get": lambda: [direct.get(k) for k in keys],
+    }
+
+
+if __name__ == "__main__":
+    lru = LRUCache(max_entries=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    lru.get("a")
+    lru.put("c", 3)  # evicts b, the least recently used
+    assert "b" not in lru and lru.get("a") == 1 and lru.stats()["evictions"] == 1
+
+    lfu = LFUCache(max_entries=2)
+    lfu.put("a", 1)
+    lfu.put("b", 2)
+    lfu.get("a")
+    lfu.get("a")
+    lfu.get("b")
+    lfu.put("c", 3)  # evicts b (freq 2) rather than a (freq 3)
+    assert "b" not in lfu and "a" in lfu and "c" in lfu
+
+    now = [0.0]
+    ttl = TTLCache(ttl=10.0, clock=lambda: now[0])
+    ttl.put("k", "v")
+    now[0] = 9.0
+    assert ttl.get("k") == "v"
+    now[0] = 10.0
+    assert ttl.get("k") is None and ttl.stats()["expirations"] == 1
+
+    sized = LRUCache(max_entries=None, max_bytes=200, sizeof=len)
+    sized.put(1, "x" * 120)
+    sized.put(2, "y" * 120)  # 240 bytes > 200: evicts key 1
+    assert 1 not in sized and sized.current_bytes == 120
+
+    calls = []
+
+    @memoize(maxsize=32)
+    def slow_square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    assert [slow_square(3), slow_square(3), slow_square(4)] == [9, 9, 16] and calls == [3, 4]
+    print("Cache stats:", slow_square.cache.stats())
+    print("Caches: PASS")
@@ -0,0 +1,583 @@
+"""
+07-pipelines: Composable streaming pipelines (generalizes generator_pipeline in 04-ml-memory).
+
+    Pipeline(source).map(parse).filter(valid).batch(256).map(embed, mode="thread")
+
+Stages: map, filter, flat_map, batch, map_batches; terminal: iteration, reduce, collect.
+Each stage runs in its own thread and talks to its neighbours through bounded
+queues, so a slow stage makes upstream stages block instead of buffering the
+whole stream (backpressure; memory ~ stages * maxsize items).
+
+Execution modes per stage:
+- "inline":  fn runs in the stage thread (cheap Python work)
+- "thread":  fn runs on a ThreadPoolExecutor (I/O, GIL-releasing numpy/pandas)
+- "process": fn runs on a ProcessPoolExecutor (CPU-bound Python; fn and items
+             must be picklable, i.e. top-level functions)
+Pool stages keep up to 2 * workers items in flight and emit results in input
+order (ordered=True) or as they complete.
+
+map_batches(fn, BatchPolicy(...)) groups items into micro-batches (flushed on a
+count, a byte budget or a latency deadline), calls a vectorized fn once per
+batch and re-emits the results one by one, so downstream stages never see the
+batching. With target_throughput set, the batch size is re-tuned after every
+full batch from the measured per-batch latency.
+
+Async: Pipeline.from_async(agen) accepts an async iterator as the source and
+`async for x in pipeline` consumes results without blocking the event loop.
+Under `async for` the source is driven on the caller's loop (so sources tied
+to it, like an asyncio.Queue, work) and results are handed back through
+loop.call_soon_threadsafe; cancelling the consumer stops every stage.
+
+stats() reports per-stage items in/out, busy time, mean latency, throughput
+and time spent blocked on a full downstream queue, which makes the bottleneck
+stage visible (high busy time; upstream stages blocked).
+"""
+
+from __future__ import annotations
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import asyncio
+import queue
+import sys
+import threading
+import time
+
+_END = object()
+_TIMEOUT = object()
+
+
+class _Failure:
+    """Carries an exception from a stage thread to the consumer."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+class _Stopped(Exception):
+    pass
+
+
+def _apply_map(fn: Callable[[Any], Any], item: Any) -> List[Any]:
+    return [fn(item)]
+
+
+def _apply_filter(pred: Callable[[Any], bool], item: Any) -> List[Any]:
+    return [item] if pred(item) else []
+
+
+def _apply_flat(fn: Callable[[Any], Iterable[Any]], item: Any) -> List[Any]:
+    return list(fn(item))
+
+
+def _item_bytes(item: Any) -> int:
+    nbytes = getattr(item, "nbytes", None)
+    return int(nbytes) if nbytes is not None else sys.getsizeof(item)
+
+
+class BatchPolicy:
+    """When to flush a micro-batch, and how to auto-tune its size.
+
+    A batch is flushed when it holds `max_items` items, when its items reach
+    `max_bytes` (`.nbytes` for arrays, sys.getsizeof otherwise), or
+    `max_latency_s` after its first item arrived, whichever comes first.
+
+    If `target_throughput` (items/s) is set, every full batch rescales
+    max_items by target / measured throughput (clamped to x0.5..x2 per step
+    and to [min_items, max_items_cap]): too slow -> bigger batches amortize
+    per-call overhead; faster than needed -> smaller batches cut latency.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 256,
+        max_bytes: Optional[int] = None,
+        max_latency_s: Optional[float] = None,
+        target_throughput: Optional[float] = None,
+        min_items: int = 1,
+        max_items_cap: int = 1 << 16,
+    ) -> None:
+        if not 1 <= min_items <= max_items <= max_items_cap:
+            raise ValueError("need 1 <= min_items <= max_items <= max_items_cap")
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_latency_s = max_latency_s
+        self.target_throughput = target_throughput
+        self.min_items = min_items
+        self.max_items_cap = max_items_cap
+        self.history: List[Tuple[int, float]] = []  # (batch size, seconds)
+
+    def observe(self, n: int, seconds: float) -> None:
+        self.history.append((n, seconds))
+        if self.target_throughput is None or n < self.max_items or seconds <= 0:
+            return  # only full batches say anything about the current size
+        ratio = min(2.0, max(0.5, self.target_throughput / (n / seconds)))
+        self.max_items = min(self.max_items_cap, max(self.min_items, int(round(self.max_items * ratio))))
+
+
+class _Stage:
+    def __init__(self, name: str, kind: str, fn: Optional[Callable], mode: str, workers: int, ordered: bool, size: int = 0) -> None:
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"unknown mode {mode!r}")
+        self.name = name
+        self.kind = kind
+        self.fn = fn
+        self.mode = mode
+        self.workers = workers
+        self.ordered = ordered
+        self.size = size
+        self.policy: Optional[BatchPolicy] = None
+        self.collate: Optional[Callable[[List[Any]], Any]] = None
+        self.batches = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_s = 0.0
+        self.blocked_s = 0.0
+        self.started = 0.0
+        self.finished = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        end = self.finished or time.perf_counter()
+        elapsed = max(end - self.started, 1e-12) if self.started else 0.0
+        row = {
+            "stage": self.name,
+            "mode": self.mode,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "busy_s": self.busy_s,
+            "mean_latency_s": self.busy_s / self.items_in if self.items_in else 0.0,
+            "throughput_per_s": self.items_out / elapsed if elapsed else 0.0,
+            "blocked_s": self.blocked_s,
+        }
+        if self.policy is not None:
+            row["batches"] = self.batches
+            row["batch_size"] = self.policy.max_items
+        return row
+
+
+class Pipeline:
+    """Chainable description of stages; runs when iterated, reduced or collected."""
+
+    def __init__(self, source: Iterable[Any], maxsize: int = 64) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self._source = source
+        self._async_source: Optional[AsyncIterator[Any]] = None
+        self.maxsize = maxsize
+        self._stages: List[_Stage] = []
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @classmethod
+    def from_async(cls, source: AsyncIterator[Any], maxsize: int = 64) -> "Pipeline":
+        p = cls((), maxsize)
+        p._async_source = source
+        return p
+
+    # -- building -------------------------------------------------------
+    def _add(self, kind: str, fn: Optional[Callable], mode: str, workers: int, ordered: bool, name: Optional[str], size: int = 0) -> "Pipeline":
+        label = name or f"{len(self._stages)}:{kind}" + (f"({getattr(fn, '__name__', 'fn')})" if fn else "")
+        self._stages.append(_Stage(label, kind, fn, mode, workers, ordered, size))
+        return self
+
+    def map(self, fn: Callable[[Any], Any], mode: str = "inline", workers: int = 4, ordered: bool = True, name: Optional[str] = None) -> "Pipeline":
+        return self._add("map", fn, mode, workers, ordered, name)
+
+    def filter(self, pred: Callable[[Any], bool], mode: str = "inline", workers: int = 4, ordered: bool = True, name: Optional[str] = None) -> "Pipeline":
+        return self._add("filter", pred, mode, workers, ordered, name)
+
+    def flat_map(self, fn: Callable[[Any], Iterable[Any]], mode: str = "inline", workers: int = 4, ordered: bool = True, name: Optional[str] = None) -> "Pipeline":
+        return self._add("flat_map", fn, mode, workers, ordered, name)
+
+    def batch(self, size: int, name: Optional[str] = None) -> "Pipeline":
+        """Group items into lists of `size` (the last batch may be shorter)."""
+        if size <= 0:
+            raise ValueError("batch size must be positive")
+        return self._add("batch", None, "inline", 1, True, name, size)
+
+    def map_batches(
+        self,
+        fn: Callable[[Any], Sequence[Any]],
+        policy: Optional[BatchPolicy] = None,
+        collate: Optional[Callable[[List[Any]], Any]] = None,
+        name: Optional[str] = None,
+    ) -> "Pipeline":
+        """Apply vectorized `fn` to micro-batches; its results are emitted one per input item.
+
+        fn receives `collate(items)` (the list itself by default, e.g. np.stack
+        for arrays) and must return a sequence of the same length.
+        """
+        self._add("map_batches", fn, "inline", 1, True, name)
+        self._stages[-1].policy = policy or BatchPolicy()
+        self._stages[-1].collate = collate
+        return self
+
+    # -- running --------------------------------------------------------
+    def _put(self, q: "queue.Queue[Any]", item: Any, stage: Optional[_Stage] = None) -> None:
+        t0 = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                q.put(item, timeout=0.05)
+                break
+            except queue.Full:
+                continue
+        if stage is not None:
+            stage.blocked_s += time.perf_counter() - t0
+
+    def _get(self, q: "queue.Queue[Any]", deadline: Optional[float] = None) -> Any:
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            wait_s = 0.05
+            if deadline is not None:
+                wait_s = min(wait_s, deadline - time.perf_counter())
+                if wait_s <= 0:
+                    return _TIMEOUT
+            try:
+                return q.get(timeout=wait_s)
+            except queue.Empty:
+                continue
+
+    def _feed(self, out_q: "queue.Queue[Any]") -> None:
+        try:
+            if self._async_source is not None:
+                # plain (sync) iteration: no caller loop exists, give the source its own
+                async def pump() -> None:
+                    async for item in self._async_source:
+                        self._put(out_q, item)
+
+                asyncio.run(pump())
+            else:
+                for item in self._source:
+                    self._put(out_q, item)
+            self._put(out_q, _END)
+        except _Stopped:
+            pass
+        except BaseException as exc:  # forward to the consumer
+            try:
+                self._put(out_q, _Failure(exc))
+            except _Stopped:
+                pass
+
+    async def _put_async(self, q: "queue.Queue[Any]", item: Any) -> None:
+        try:
+            q.put_nowait(item)
+        except queue.Full:  # wait for room off-loop; _put gives up once _stop is set
+            await asyncio.get_running_loop().run_in_executor(None, self._put, q, item)
+
+    async def _pump(self, out_q: "queue.Queue[Any]") -> None:
+        """_feed for `async for`: iterate the async source on the caller's loop."""
+        try:
+            async for item in self._async_source:
+                await self._put_async(out_q, item)
+            await self._put_async(out_q, _END)
+        except _Stopped:
+            pass
+        except Exception as exc:
+            try:
+                await self._put_async(out_q, _Failure(exc))
+            except _Stopped:
+                pass
+
+    def _forward(self, out_q: "queue.Queue[Any]", loop: asyncio.AbstractEventLoop, ready: "asyncio.Queue[Any]", slots: threading.Semaphore) -> None:
+        """Move results onto the consumer's loop; `slots` keeps at most maxsize in transit."""
+        try:
+            while True:
+                while not slots.acquire(timeout=0.05):
+                    if self._stop.is_set():
+                        return
+                item = self._get(out_q)
+                loop.call_soon_threadsafe(ready.put_nowait, item)
+                if item is _END or isinstance(item, _Failure):
+                    return
+        except (_Stopped, RuntimeError):  # RuntimeError: the loop is already closed
+            pass
+
+    def _inputs(self, in_q: "queue.Queue[Any]", out_q: "queue.Queue[Any]", stage: _Stage) -> Iterator[Any]:
+        """Yield upstream items until _END; failures are passed straight through."""
+        while True:
+            item = self._get(in_q)
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                self._put(out_q, item)
+                raise _Stopped()
+            stage.items_in += 1
+            yield item
+
+    def _emit(self, out_q: "queue.Queue[Any]", stage: _Stage, results: List[Any]) -> None:
+        for r in results:
+            self._put(out_q, r, stage)
+            stage.items_out += 1
+
+    def _run_stage(self, stage: _Stage, in_q: "queue.Queue[Any]", out_q: "queue.Queue[Any]") -> None:
+        stage.started = time.perf_counter()
+        try:
+            if stage.kind == "map_batches":
+                self._run_micro_batches(stage, in_q, out_q)
+            elif stage.kind == "batch":
+                buf: List[Any] = []
+                for item in self._inputs(in_q, out_q, stage):
+                    buf.append(item)
+                    if len(buf) == stage.size:
+                        self._emit(out_q, stage, [buf])
+                        buf = []
+                if buf:
+                    self._emit(out_q, stage, [buf])
+            else:
+                apply = {"map": _apply_map, "filter": _apply_filter, "flat_map": _apply_flat}[stage.kind]
+                if stage.mode == "inline":
+                    for item in self._inputs(in_q, out_q, stage):
+                        t0 = time.perf_counter()
+                        results = apply(stage.fn, item)
+                        stage.busy_s += time.perf_counter() - t0
+                        self._emit(out_q, stage, results)
+                else:
+                    pool_cls = ThreadPoolExecutor if stage.mode == "thread" else ProcessPoolExecutor
+                    with pool_cls(max_workers=stage.workers) as ex:
+                        self._run_pooled(stage, ex, apply, in_q, out_q)
+            self._put(out_q, _END)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            try:
+                self._put(out_q, _Failure(exc))
+            except _Stopped:
+                pass
+        finally:
+            stage.finished = time.perf_counter()
+
+    def _run_micro_batches(self, stage: _Stage, in_q: "queue.Queue[Any]", out_q: "queue.Queue[Any]") -> None:
+        policy = stage.policy
+        assert policy is not None
+        finished = False
+        while not finished:
+            buf: List[Any] = []
+            nbytes = 0
+            deadline: Optional[float] = None
+            while len(buf) < policy.max_items:
+                item = self._get(in_q, deadline)
+                if item is _TIMEOUT:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                if isinstance(item, _Failure):
+                    self._put(out_q, item)
+                    raise _Stopped()
+                stage.items_in += 1
+                buf.append(item)
+                if deadline is None and policy.max_latency_s is not None:
+                    deadline = time.perf_counter() + policy.max_latency_s
+                if policy.max_bytes is not None:
+                    nbytes += _item_bytes(item)
+                    if nbytes >= policy.max_bytes:
+                        break
+            if not buf:
+                continue
+            t0 = time.perf_counter()
+            results = stage.fn(stage.collate(buf) if stage.collate else buf)
+            dt = time.perf_counter() - t0
+            if len(results) != len(buf):
+                raise ValueError(f"{stage.name}: batch fn returned {len(results)} results for {len(buf)} items")
+            stage.busy_s += dt
+            stage.batches += 1
+            policy.observe(len(buf), dt)
+            self._emit(out_q, stage, list(results))
+
+    def _run_pooled(self, stage: _Stage, ex: Executor, apply: Callable, in_q, out_q) -> None:
+        window = 2 * stage.workers
+        inflight: deque = deque()  # (future, submit_time)
+
+        def drain(block_until: int) -> None:
+            while len(inflight) > block_until:
+                if stage.ordered:
+                    fut, t0 = inflight.popleft()
+                    results = fut.result()
+                else:
+                    done, _ = wait([f for f, _ in inflight], return_when=FIRST_COMPLETED)
+                    idx = next(i for i, (f, _) in enumerate(inflight) if f in done)
+                    fut, t0 = inflight[idx]
+                    del inflight[idx]
+                    results = fut.result()
+                stage.busy_s += time.perf_counter() - t0
+                self._emit(out_q, stage, results)
+
+        for item in self._inputs(in_q, out_q, stage):
+            inflight.append((ex.submit(apply, stage.fn, item), time.perf_counter()))
+            drain(window - 1)
+        drain(0)
+
+    def _start(self, feed: bool = True) -> Tuple["queue.Queue[Any]", "queue.Queue[Any]"]:
+        """Start the stage threads (and the source thread if `feed`); return (source queue, output queue)."""
+        if self._threads:
+            raise RuntimeError("a Pipeline can only be run once")
+        self._stop.clear()
+        q: "queue.Queue[Any]" = queue.Queue(self.maxsize)
+        in_q = q
+        if feed:
+            self._threads.append(threading.Thread(target=self._feed, args=(q,), daemon=True))
+        for stage in self._stages:
+            nq: "queue.Queue[Any]" = queue.Queue(self.maxsize)
+            self._threads.append(threading.Thread(target=self._run_stage, args=(stage, q, nq), daemon=True))
+            q = nq
+        for t in self._threads:
+            t.start()
+        return in_q, q
+
+    def close(self) -> None:
+        """Stop all stage threads (used when the consumer stops early)."""
+        self._stop.set()
+        for t in self._threads:
+            t.join()
+
+    def __iter__(self) -> Iterator[Any]:
+        _, out_q = self._start()
+        try:
+            while True:
+                item = out_q.get()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            self.close()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        loop = asyncio.get_running_loop()
+        in_q, out_q = self._start(feed=self._async_source is None)
+        ready: "asyncio.Queue[Any]" = asyncio.Queue()
+        slots = threading.Semaphore(self.maxsize)
+        forwarder = threading.Thread(target=self._forward, args=(out_q, loop, ready, slots), daemon=True)
+        self._threads.append(forwarder)
+        forwarder.start()
+        pump = loop.create_task(self._pump(in_q)) if self._async_source is not None else None
+        try:
+            while True:
+                item = await ready.get()
+                slots.release()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            self._stop.set()
+            if pump is not None:
+                pump.cancel()
+                await asyncio.gather(pump, return_exceptions=True)
+            await loop.run_in_executor(None, self.close)
+
+    def collect(self) -> List[Any]:
+        return list(self)
+
+    def reduce(self, fn: Callable[[Any, Any], Any], initial: Any) -> Any:
+        acc = initial
+        for item in self:
+            acc = fn(acc, item)
+        return acc
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [s.stats() for s in self._stages]
+
+
+def print_stats(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'stage':28s} {'mode':>8s} {'in':>8s} {'out':>8s} {'busy_s':>9s} {'lat_ms':>8s} {'items/s':>10s} {'blocked_s':>9s}")
+    for r in rows:
+        print(
+            f"{r['stage']:28s} {r['mode']:>8s} {r['items_in']:8d} {r['items_out']:8d} {r['busy_s']:9.4f} "
+            f"{r['mean_latency_s'] * 1e3:8.3f} {r['throughput_per_s']:10.1f} {r['blocked_s']:9.4f}"
+        )
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+def _is_even(x: int) -> bool:
+    return x % 2 == 0
+
+
+if __name__ == "__main__":
+    # inline + process + thread stages, ordered output
+    p = (
+        Pipeline(range(20), maxsize=4)
+        .filter(_is_even)
+        .map(_square, mode="process", workers=2)
+        .flat_map(lambda x: (x, -x), mode="thread", workers=2)
+        .batch(4)
+    )
+    batches = p.collect()
+    assert batches[0] == [0, 0, 4, -4] and sum(len(b) for b in batches) == 20
+    print_stats(p.stats())
+
+    # unordered output still yields every result once
+    out = Pipeline(range(50)).map(_square, mode="thread", workers=4, ordered=False).collect()
+    assert sorted(out) == [x * x for x in range(50)]
+
+    assert Pipeline(range(10)).map(_square).reduce(lambda a, b: a + b, 0) == 285
+
+    async def agen():
+        for i in range(5):
+            await asyncio.sleep(0)
+            yield i
+
+    async def consume() -> List[int]:
+        return [x async for x in Pipeline.from_async(agen()).map(_square)]
+
+    assert asyncio.run(consume()) == [0, 1, 4, 9, 16]
+
+    async def from_queue() -> List[int]:
+        # the source is bound to this loop; the pipeline must drive it here
+        q: "asyncio.Queue[Optional[int]]" = asyncio.Queue()
+
+        async def drain():
+            while (x := await q.get()) is not None:
+                yield x
+
+        for x in [3, 4, None]:
+            q.put_nowait(x)
+        return [x async for x in Pipeline.from_async(drain()).map(_square)]
+
+    assert asyncio.run(from_queue()) == [9, 16]
+
+    async def cancelled() -> None:
+        async def consume_slowly():
+            async for _ in Pipeline(iter(lambda: time.sleep(0.01) or 0, 1)).map(_square):
+                pass
+
+        try:
+            await asyncio.wait_for(consume_slowly(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(cancelled())  # returns instead of hanging in shutdown_default_executor
+
+    # errors surface in the consumer; early exit shuts stages down
+    try:
+        Pipeline([1, 0]).map(lambda x: 1 // x).collect()
+        raise AssertionError("expected ZeroDivisionError")
+    except ZeroDivisionError:
+        pass
+    for x in Pipeline(iter(range(10**9))).map(_square):
+        if x > 100:
+            break
+
+    # micro-batches: one vectorized call per batch, results unbatched downstream
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        np = None
+    if np is not None:
+        policy = BatchPolicy(max_items=8, max_latency_s=0.01, target_throughput=1e9)
+        p = Pipeline(range(5000)).map_batches(lambda a: np.square(a), policy, collate=np.asarray).filter(_is_even)
+        assert p.collect() == [x * x for x in range(0, 5000, 2)]
+        row = p.stats()[0]
+        assert row["batch_size"] > 8 and row["batches"] < 5000 // 8
+        print(f"map_batches: {row['batches']} batches, tuned batch size {row['batch_size']}")
+    sizes = Pipeline(range(10)).map_batches(lambda b: [len(b)] * len(b), BatchPolicy(max_items=100, max_bytes=3 * sys.getsizeof(1))).collect()
+    assert sizes[:3] == [3, 3, 3]
+    print("Pipelines: PASS")
@@ -6,6 +6,9 @@ This content has been split into focused modules under Day1:
 - 02-collections.py
 - 03-two-sum.py
 - 04-ml-memory.py
+- 05-benchmarks.py
+- 06-caches.py
+- 07-pipelines.py
 
 Run those files directly for examples, tiny benchmarks, and tips.
 """
@@ -16,4 +19,7 @@ if __name__ == "__main__":
 	print("  - 02-collections.py")
 	print("  - 03-two-sum.py")
 	print("  - 04-ml-memory.py")
+	print("  - 05-benchmarks.py")
+	print("  - 06-caches.py")
+	print("  - 07-pipelines.py")
 
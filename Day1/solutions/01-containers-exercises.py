@@ -6,11 +6,24 @@ Includes commented solutions for:
 2) Rotate list right by k (in-place and slice variants)
 3) Maintain sorted list under inserts (bisect)
 4) Flatten one level of nesting
+
+Extension: SortedList keeps values sorted in O(log n) amortized per insert /
+remove / rank / index (insert_sorted_stream's bisect.insort is O(n) per insert).
+benchmark_cases compares the two; run Day1/05-benchmarks.py --filter containers-exercises.
+
+Running quantiles on top of the sorted stream (p50/p95/p99 of latencies):
+- RunningMedian: exact median with two heaps, O(log n) per value
+- KLLSketch: approximate quantiles in O(k log(n/k)) memory, mergeable
+- SlidingQuantile: exact quantiles over the last `window` values (SortedList + deque)
 """
 
 from __future__ import annotations
-from typing import Iterable, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
 import bisect
+import heapq
+import math
+import random
 
 def stable_dedupe(seq: Iterable[int]) -> List[int]:
     """Order-preserving dedupe using a seen set.
@@ -82,6 +95,459 @@ def insert_sorted_stream(values: Iterable[int]) -> List[int]:
     return sorted_list
 
 
+class SortedList:
+    """Sorted container built from bounded-size sorted sublists.
+
+    Layout (the idea behind the `sortedcontainers` package):
+    - _lists: sorted sublists of at most 2 * load values each
+    - _maxes: last value of every sublist, bisected to find the right sublist
+    - _index: Fenwick tree over sublist lengths, for rank <-> position lookups
+
+    Inserting shifts at most 2 * load values in one sublist plus an O(log m)
+    index update (m sublists), instead of shifting up to n values as
+    bisect.insort does. Splits/merges rebuild the index lazily.
+    """
+
+    def __init__(self, values: Iterable[Any] = (), load: int = 1000) -> None:
+        if load < 4:
+            raise ValueError("load must be >= 4")
+        self._load = load
+        self._len = 0
+        self._lists: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._index: Optional[List[int]] = None  # 1-based Fenwick tree, None = stale
+        self.update(values)
+
+    # -- internal index -------------------------------------------------
+    def _build_index(self) -> List[int]:
+        m = len(self._lists)
+        tree = [0] * (m + 1)
+        for i, sub in enumerate(self._lists, 1):
+            tree[i] += len(sub)
+            j = i + (i & -i)
+            if j <= m:
+                tree[j] += tree[i]
+        self._index = tree
+        return tree
+
+    def _index_add(self, pos: int, delta: int) -> None:
+        tree = self._index
+        if tree is None:
+            return
+        i = pos + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _offset(self, pos: int) -> int:
+        """Number of values in sublists before sublist `pos`."""
+        tree = self._index or self._build_index()
+        total, i = 0, pos
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, idx: int) -> Tuple[int, int]:
+        """Map a global index to (sublist, offset) by Fenwick descent."""
+        tree = self._index or self._build_index()
+        pos, step = 0, 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= idx:
+                pos = nxt
+                idx -= tree[nxt]
+            step >>= 1
+        return pos, idx
+
+    def _normalize(self, idx: int) -> int:
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("SortedList index out of range")
+        return idx
+
+    # -- mutation -------------------------------------------------------
+    def add(self, value: Any) -> None:
+        if not self._lists:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._index = None
+            self._len = 1
+            return
+        pos = bisect.bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._lists[pos].append(value)
+            self._maxes[pos] = value
+        else:
+            bisect.insort(self._lists[pos], value)
+        self._len += 1
+        sub = self._lists[pos]
+        if len(sub) > 2 * self._load:
+            half = sub[self._load:]
+            del sub[self._load:]
+            self._maxes[pos] = sub[-1]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos + 1, half[-1])
+            self._index = None
+        else:
+            self._index_add(pos, 1)
+
+    def update(self, values: Iterable[Any]) -> None:
+        values = list(values)
+        if not values:
+            return
+        if self._len < len(values):
+            # bulk load: one sort then re-chunk, cheaper than repeated adds
+            merged = sorted(self._flat() + values)
+            self._lists = [merged[i:i + self._load] for i in range(0, len(merged), self._load)]
+            self._maxes = [sub[-1] for sub in self._lists]
+            self._len = len(merged)
+            self._index = None
+        else:
+            for v in values:
+                self.add(v)
+
+    def copy(self) -> "SortedList":
+        """Shallow copy: sublists are copied, no re-sort (the analogue of list.copy)."""
+        out = SortedList.__new__(SortedList)
+        out._load = self._load
+        out._len = self._len
+        out._lists = [sub.copy() for sub in self._lists]
+        out._maxes = self._maxes.copy()
+        out._index = None if self._index is None else self._index.copy()
+        return out
+
+    def _delete(self, pos: int, off: int) -> Any:
+        sub = self._lists[pos]
+        value = sub.pop(off)
+        self._len -= 1
+        if not sub:
+            del self._lists[pos], self._maxes[pos]
+            self._index = None
+            return value
+        self._maxes[pos] = sub[-1]
+        if len(sub) < self._load // 2 and len(self._lists) > 1:
+            # merge small sublist into a neighbour, re-split if it grew too large
+            nb = pos - 1 if pos > 0 else pos
+            self._lists[nb].extend(self._lists.pop(nb + 1))
+            self._maxes.pop(nb + 1)
+            joined = self._lists[nb]
+            if len(joined) > 2 * self._load:
+                half = joined[self._load:]
+                del joined[self._load:]
+                self._lists.insert(nb + 1, half)
+                self._maxes.insert(nb + 1, half[-1])
+            self._maxes[nb] = joined[-1]
+            self._index = None
+        else:
+            self._index_add(pos, -1)
+        return value
+
+    def discard(self, value: Any) -> bool:
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        off = bisect.bisect_left(self._lists[pos], value)
+        if self._lists[pos][off] != value:
+            return False
+        self._delete(pos, off)
+        return True
+
+    def remove(self, value: Any) -> None:
+        if not self.discard(value):
+            raise ValueError(f"{value!r} not in SortedList")
+
+    def pop(self, index: int = -1) -> Any:
+        return self._delete(*self._locate(self._normalize(index)))
+
+    # -- queries --------------------------------------------------------
+    def bisect_left(self, value: Any) -> int:
+        """Rank of value: number of stored values < value."""
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._offset(pos) + bisect.bisect_left(self._lists[pos], value)
+
+    def bisect_right(self, value: Any) -> int:
+        pos = bisect.bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._offset(pos) + bisect.bisect_right(self._lists[pos], value)
+
+    rank = bisect_left
+
+    def count(self, value: Any) -> int:
+        return self.bisect_right(value) - self.bisect_left(value)
+
+    def __contains__(self, value: Any) -> bool:
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sub = self._lists[pos]
+        off = bisect.bisect_left(sub, value)
+        return sub[off] == value
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self._len)
+            if step == 1:
+                return list(self.islice(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        pos, off = self._locate(self._normalize(idx))
+        return self._lists[pos][off]
+
+    def __delitem__(self, idx: int) -> None:
+        self.pop(idx)
+
+    def islice(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Any]:
+        """Iterate values at positions [start, stop) without copying everything."""
+        stop = self._len if stop is None else min(stop, self._len)
+        if start >= stop:
+            return
+        pos, off = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = self._lists[pos][off:off + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            pos, off = pos + 1, 0
+
+    def irange(self, lo: Any = None, hi: Any = None, inclusive: Tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        """Iterate values v with lo <= v <= hi (bounds optional, inclusivity configurable)."""
+        start = 0 if lo is None else (self.bisect_left(lo) if inclusive[0] else self.bisect_right(lo))
+        stop = self._len if hi is None else (self.bisect_right(hi) if inclusive[1] else self.bisect_left(hi))
+        return self.islice(start, stop)
+
+    def _flat(self) -> List[Any]:
+        return [v for sub in self._lists for v in sub]
+
+    def __iter__(self) -> Iterator[Any]:
+        for sub in self._lists:
+            yield from sub
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"SortedList({self._flat()!r})"
+
+
+def insert_sorted_stream_fast(values: Iterable[int]) -> List[int]:
+    """insert_sorted_stream via SortedList: O(n log n) overall instead of O(n^2)."""
+    sl = SortedList()
+    for v in values:
+        sl.add(v)
+    return list(sl)
+
+
+def _interpolated_quantile(sorted_vals, q: float) -> float:
+    """Linear interpolation between closest ranks (numpy's default method)."""
+    if not 0.0 <= q <= 1.0:
+        raise ValueError("q must be in [0, 1]")
+    n = len(sorted_vals)
+    if n == 0:
+        raise ValueError("no values")
+    pos = (n - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, n - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+class RunningMedian:
+    """Exact running median with two heaps.
+
+    lower is a max-heap (stored negated) holding the smaller half, upper a
+    min-heap with the larger half; len(lower) - len(upper) is 0 or 1.
+    add is O(log n), median is O(1). Values must be numeric (negation).
+    """
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self._lower: List[float] = []
+        self._upper: List[float] = []
+        for v in values:
+            self.add(v)
+
+    def add(self, value: float) -> None:
+        if self._lower and value > -self._lower[0]:
+            heapq.heappush(self._upper, value)
+        else:
+            heapq.heappush(self._lower, -value)
+        if len(self._lower) > len(self._upper) + 1:
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+        elif len(self._upper) > len(self._lower):
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+
+    def median(self) -> float:
+        if not self._lower:
+            raise ValueError("no values")
+        if len(self._lower) > len(self._upper):
+            return -self._lower[0]
+        return (-self._lower[0] + self._upper[0]) / 2
+
+    def __len__(self) -> int:
+        return len(self._lower) + len(self._upper)
+
+
+class KLLSketch:
+    """KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Level h holds items of weight 2**h. When a level reaches its capacity
+    (k at the top, shrinking by factor c per level below) it is sorted and every
+    other item, with a random offset, is promoted to level h + 1. Memory is
+    O(k log(n / k)) and rank error is about O(1/k) * n with high probability.
+    Sketches with the same k can be merged (e.g. per-shard latencies).
+    """
+
+    def __init__(self, k: int = 200, c: float = 2.0 / 3.0, seed: Optional[int] = None) -> None:
+        if k < 8 or not 0.5 <= c < 1.0:
+            raise ValueError("need k >= 8 and 0.5 <= c < 1")
+        self.k = k
+        self.c = c
+        self.n = 0
+        self._rng = random.Random(seed)
+        self._levels: List[List[float]] = []
+        self._size = 0
+        self._max_size = 0
+        self._grow()
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - h - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _compress(self) -> None:
+        for h in range(len(self._levels)):
+            level = self._levels[h]
+            if len(level) >= self._capacity(h):
+                if h + 1 >= len(self._levels):
+                    self._grow()
+                level.sort()
+                keep = [level[0]] if len(level) % 2 else []
+                start = len(keep) + (self._rng.random() < 0.5)
+                self._levels[h + 1].extend(level[start::2])
+                self._levels[h] = keep
+                self._size = sum(len(lv) for lv in self._levels)
+                if self._size < self._max_size:
+                    break
+
+    def update(self, value: float) -> None:
+        self._levels[0].append(value)
+        self._size += 1
+        self.n += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Fold another sketch into this one (in place)."""
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for h, level in enumerate(other._levels):
+            self._levels[h].extend(level)
+        self.n += other.n
+        self._size = sum(len(lv) for lv in self._levels)
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        items = [(v, 1 << h) for h, level in enumerate(self._levels) for v in level]
+        items.sort()
+        return items
+
+    def rank(self, value: float) -> int:
+        """Estimated number of values <= value."""
+        return sum(w for v, w in self._weighted() if v <= value)
+
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            raise ValueError("no values")
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be in [0, 1]")
+        items = self._weighted()
+        target = q * sum(w for _, w in items)
+        acc = 0
+        for v, w in items:
+            acc += w
+            if acc >= target:
+                return v
+        return items[-1][0]
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        return [self.quantile(q) for q in qs]
+
+    def __len__(self) -> int:
+        return self._size  # retained items, not n
+
+
+class SlidingQuantile:
+    """Exact quantiles over the most recent `window` values.
+
+    A deque remembers arrival order; a SortedList answers quantiles. Each push
+    inserts the new value and removes the expired one, both O(log n) amortized,
+    which is what makes the windowed variant possible (heaps cannot remove
+    arbitrary values cheaply).
+    """
+
+    def __init__(self, window: int) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._order: deque = deque()
+        self._sorted = SortedList()
+
+    def push(self, value: float) -> None:
+        self._order.append(value)
+        self._sorted.add(value)
+        if len(self._order) > self.window:
+            self._sorted.remove(self._order.popleft())
+
+    def quantile(self, q: float) -> float:
+        return _interpolated_quantile(self._sorted, q)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+def benchmark_cases(n: int = 20000) -> Dict[str, Callable[[], Any]]:
+    """insort list vs SortedList for inserts, reads by index, and deletes.
+
+    Discovered by Day1/05-benchmarks.py.
+    """
+    rng = random.Random(0)
+    values = [rng.randrange(n * 10) for _ in range(n)]
+    probes = [rng.randrange(n) for _ in range(min(n, 2000))]
+    base_list = sorted(values)
+    base_sl = SortedList(values)
+
+    def insort_delete() -> None:
+        lst = base_list.copy()
+        for v in values[: n // 2]:
+            lst.remove(v)
+
+    # both delete cases start from a prebuilt container and time only a copy
+    # of it, so construction (sort + chunking) stays out of the comparison
+    def sortedlist_delete() -> None:
+        sl = base_sl.copy()
+        for v in values[: n // 2]:
+            sl.remove(v)
+
+    return {
+        "insort_insert": lambda: insert_sorted_stream(values),
+        "sortedlist_insert": lambda: insert_sorted_stream_fast(values),
+        "insort_read": lambda: [base_list[i] for i in probes],
+        "sortedlist_read": lambda: [base_sl[i] for i in probes],
+        "insort_delete": insort_delete,
+        "sortedlist_delete": sortedlist_delete,
+    }
+
+
 def flatten_one_level(lists: Iterable[Iterable[int]]) -> List[int]:
     """Flatten one level of nesting.
 
@@ -106,6 +572,29 @@ if __name__ == "__main__":
     # 3) maintain sorted
     assert insert_sorted_stream([3, 1, 4, 1, 5]) == [1, 1, 3, 4, 5]
 
+    # 3b) SortedList: same order as insort, plus rank / index / range queries
+    sl = SortedList([3, 1, 4, 1, 5], load=4)
+    sl.update([9, 2, 6])
+    assert list(sl) == insert_sorted_stream([3, 1, 4, 1, 5, 9, 2, 6])
+    assert sl[0] == 1 and sl[-1] == 9 and sl.bisect_left(4) == 4 and sl.count(1) == 2
+    assert list(sl.irange(2, 5)) == [2, 3, 4, 5]
+    sl.remove(1)
+    assert sl.pop(0) == 1 and 1 not in sl and len(sl) == 6
+
+    # 3c) running quantiles
+    rm = RunningMedian([5, 1, 4])
+    assert rm.median() == 4
+    rm.add(2)
+    assert rm.median() == 3.0
+    sq = SlidingQuantile(window=3)
+    for v in [10, 1, 7, 3]:
+        sq.push(v)
+    assert len(sq) == 3 and sq.median() == 3 and sq.quantile(1.0) == 7
+    kll = KLLSketch(k=64, seed=0)
+    for v in range(10_000):
+        kll.update(v)
+    assert abs(kll.quantile(0.99) - 9_900) < 300 and len(kll) < 1_000
+
     # 4) flatten
     assert flatten_one_level([[1, 2], [3], [4, 5]]) == [1, 2, 3, 4, 5]
 
@@ -5,12 +5,25 @@ Includes commented solutions for:
 1) Sliding window maximum (deque, O(n))
 2) Moving average over a stream (deque + running sum)
 3) Top-k frequent elements (Counter + heapq.nlargest)
+
+Extensions:
+- TimeWindowAggregator generalizes moving_average_stream to keyed, timestamped
+  events with time-based windows, a lateness watermark and LRU key caps.
+- SpaceSaving / top_k_heavy_hitters: bounded-memory, mergeable approximate
+  top-k for high-cardinality streams (exact mode kept for validation).
+- sharded_most_common: exact counting of large files/iterables in a process
+  pool (newline-aligned byte ranges, tree-reduced Counters, stage timings).
 """
 
 from __future__ import annotations
-from typing import Iterable, List, Tuple
-from collections import deque, Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from collections import deque, Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import heapq
+import math
+import os
+import time
 
 
 def sliding_window_max(nums: List[int], k: int) -> List[int]:
@@ -71,6 +84,339 @@ def top_k_frequent(nums: Iterable[int], k: int) -> List[Tuple[int, int]]:
     return heapq.nlargest(k, c.items(), key=lambda kv: kv[1])
 
 
+class SpaceSaving:
+    """Space-Saving heavy hitters (Metwally et al.) in O(capacity) memory.
+
+    Tracks at most `capacity` values. A new value arriving when full replaces
+    the current minimum m and starts at count m + 1 with error m. For every
+    tracked value: true_count <= estimate and estimate - error <= true_count,
+    and error <= N / capacity for a stream of N items. So capacity = 1/eps gives
+    an additive error of at most eps * N, and any value with true frequency
+    > N / capacity is guaranteed to be tracked.
+
+    The minimum is found with a lazy heap of (count, value) entries; stale
+    entries are skipped and the heap is rebuilt when it grows too large.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.n = 0  # total weight seen
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, int, Hashable]] = []  # (count, tiebreak, value)
+        self._tick = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float) -> "SpaceSaving":
+        """Sketch whose estimates are within epsilon * N of the true counts."""
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon must be in (0, 1)")
+        return cls(math.ceil(1.0 / epsilon))
+
+    def _push(self, value: Hashable) -> None:
+        self._tick += 1
+        heapq.heappush(self._heap, (self.counts[value], self._tick, value))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i, v) for i, (v, c) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            c, _, v = heapq.heappop(self._heap)
+            if self.counts.get(v) == c:
+                return v, c
+
+    def update(self, value: Hashable, count: int = 1) -> None:
+        self.n += count
+        if value in self.counts:
+            self.counts[value] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[value] = count
+            self.errors[value] = 0
+        else:
+            old, m = self._pop_min()
+            del self.counts[old], self.errors[old]
+            self.counts[value] = m + count
+            self.errors[value] = m
+        self._push(value)
+
+    def update_many(self, values: Iterable[Hashable]) -> None:
+        for v in values:
+            self.update(v)
+
+    def min_count(self) -> int:
+        """Count any untracked value may have (0 while below capacity)."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Combine two sketches (e.g. from shards); the bounds still hold.
+
+        A value missing from one side may have had up to that side's min count
+        there, so it is charged that amount as both estimate and error.
+        """
+        m1, m2 = self.min_count(), other.min_count()
+        out = SpaceSaving(max(self.capacity, other.capacity))
+        merged = []
+        for v in set(self.counts) | set(other.counts):
+            c = self.counts.get(v, m1) + other.counts.get(v, m2)
+            e = self.errors.get(v, m1) + other.errors.get(v, m2)
+            merged.append((c, e, v))
+        for c, e, v in heapq.nlargest(out.capacity, merged, key=lambda t: t[0]):
+            out.counts[v] = c
+            out.errors[v] = e
+        out.n = self.n + other.n
+        out._heap = [(c, i, v) for i, (v, c) in enumerate(out.counts.items())]
+        heapq.heapify(out._heap)
+        out._tick = len(out._heap)
+        return out
+
+    def top_k(self, k: int) -> List[Tuple[Hashable, int, int]]:
+        """k largest (value, estimated_count, error) triples."""
+        if k <= 0:
+            return []
+        best = heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+        return [(v, c, self.errors[v]) for v, c in best]
+
+
+def top_k_heavy_hitters(
+    nums: Iterable[Hashable], k: int, capacity: Optional[int] = None, exact: bool = False
+) -> List[Tuple[Hashable, int, int]]:
+    """Top-k (value, estimated_count, error) triples.
+
+    exact=True uses the top_k_frequent approach (Counter + heapq.nlargest,
+    error always 0) to validate the sketch; otherwise a SpaceSaving sketch with
+    `capacity` slots (default 10 * k) bounds memory regardless of cardinality.
+    """
+    if k <= 0:
+        return []
+    if exact:
+        return [(v, c, 0) for v, c in top_k_frequent(nums, k)]
+    sketch = SpaceSaving(capacity or 10 * k)
+    sketch.update_many(nums)
+    return sketch.top_k(k)
+
+
+def _aligned_offsets(path: str, n_chunks: int) -> List[int]:
+    """Byte offsets splitting the file into ~n_chunks ranges that start at line starts."""
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, "rb") as f:
+        for k in range(1, n_chunks):
+            f.seek(max(size * k // n_chunks, offsets[-1]))
+            f.readline()  # move to the start of the next line
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > offsets[-1]:
+                offsets.append(pos)
+    offsets.append(size)
+    return offsets
+
+
+def _count_byte_range(path: str, start: int, end: int, block_size: int) -> Tuple[Counter, float, float]:
+    """Worker: count whitespace-separated tokens in [start, end); reads block by block."""
+    c: Counter = Counter()
+    read_s = count_s = 0.0
+    rest = b""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            t0 = time.perf_counter()
+            block = f.read(min(block_size, remaining))
+            t1 = time.perf_counter()
+            read_s += t1 - t0
+            if not block:
+                break
+            remaining -= len(block)
+            block = rest + block
+            cut = block.rfind(b"\n") + 1 if remaining > 0 else len(block)
+            rest = block[cut:]
+            c.update(block[:cut].decode("utf-8").split())
+            count_s += time.perf_counter() - t1
+    return c, read_s, count_s
+
+
+def _count_items(items: List[Hashable]) -> Tuple[Counter, float, float]:
+    t0 = time.perf_counter()
+    return Counter(items), 0.0, time.perf_counter() - t0
+
+
+def _merge_counters(a: Counter, b: Counter) -> Counter:
+    a.update(b)
+    return a
+
+
+def sharded_most_common(
+    source,
+    k: int,
+    workers: Optional[int] = None,
+    chunk_items: int = 1_000_000,
+    block_size: int = 1 << 20,
+) -> Tuple[List[Tuple[Hashable, int]], Dict[str, float]]:
+    """Exact most_common(k) counted in parallel shards; returns (top_k, timings).
+
+    - source is a path (whitespace-separated tokens, counted as str) or any
+      iterable of hashables.
+    - Files are split at newline-aligned byte offsets (one range per worker
+      task); each worker seeks to its range and streams it in `block_size`
+      reads, so no process reads the whole file. Iterables are sliced into
+      `chunk_items` lists and shipped to the pool with at most 2 * workers
+      chunks in flight, so the input is streamed, never materialized.
+    - Partial Counters are combined by a pairwise tree reduction in the pool
+      (log2(shards) rounds) instead of one long serial fold.
+    - timings: read_s / count_s are summed over workers (CPU time spent),
+      merge_s and wall_s are elapsed in the caller.
+    """
+    workers = workers or os.cpu_count() or 1
+    wall0 = time.perf_counter()
+    read_s = count_s = 0.0
+    partials: List[Counter] = []
+    shards = 0
+
+    def collect(f) -> None:
+        nonlocal read_s, count_s
+        c, r, cnt = f.result()
+        partials.append(c)
+        read_s += r
+        count_s += cnt
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        if isinstance(source, (str, os.PathLike)):
+            offsets = _aligned_offsets(os.fspath(source), workers * 4)
+            futures = [
+                ex.submit(_count_byte_range, os.fspath(source), a, b, block_size)
+                for a, b in zip(offsets, offsets[1:])
+            ]
+            shards = len(futures)
+            for f in futures:
+                collect(f)
+        else:
+            it = iter(source)
+            inflight: deque = deque()
+            while True:
+                t0 = time.perf_counter()
+                chunk = list(islice(it, chunk_items))
+                read_s += time.perf_counter() - t0
+                if not chunk:
+                    break
+                inflight.append(ex.submit(_count_items, chunk))
+                shards += 1
+                del chunk
+                if len(inflight) >= 2 * workers:
+                    collect(inflight.popleft())
+            while inflight:
+                collect(inflight.popleft())
+
+        t0 = time.perf_counter()
+        while len(partials) > 1:
+            merged = [ex.submit(_merge_counters, a, b) for a, b in zip(partials[::2], partials[1::2])]
+            odd = [partials[-1]] if len(partials) % 2 else []
+            partials = [m.result() for m in merged] + odd
+        merge_s = time.perf_counter() - t0
+    total = partials[0] if partials else Counter()
+    timings = {
+        "read_s": read_s,
+        "count_s": count_s,
+        "merge_s": merge_s,
+        "wall_s": time.perf_counter() - wall0,
+        "shards": float(shards),
+    }
+    return total.most_common(k) if k > 0 else [], timings
+
+
+class TimeWindowAggregator:
+    """Per-key moving stats over the last `window` time units of an event stream.
+
+    - Each key keeps a deque of (ts, value) plus a running sum, like
+      moving_average_stream, but eviction is by time instead of count.
+    - The stream clock is the max timestamp seen. Windows cover
+      (clock - window, clock]; entries at or before clock - window are evicted
+      when their key is touched or queried.
+    - Out-of-order events are accepted up to `allowed_lateness` behind the
+      clock (the watermark); older ones are dropped and counted in `late_dropped`.
+    - At most `max_keys` keys are kept; the least recently updated is evicted
+      (OrderedDict.move_to_end / popitem(last=False)).
+    """
+
+    def __init__(self, window: float, allowed_lateness: float = 0.0, max_keys: int = 100_000) -> None:
+        if window <= 0 or allowed_lateness < 0 or max_keys <= 0:
+            raise ValueError("window and max_keys must be positive, allowed_lateness >= 0")
+        self.window = window
+        self.allowed_lateness = allowed_lateness
+        self.max_keys = max_keys
+        self.clock = float("-inf")
+        self.late_dropped = 0
+        self.keys_evicted = 0
+        self._keys: "OrderedDict[Hashable, List[Any]]" = OrderedDict()  # key -> [deque, sum]
+
+    @property
+    def watermark(self) -> float:
+        return self.clock - self.allowed_lateness
+
+    def _expire(self, state: List[Any]) -> None:
+        q = state[0]
+        cutoff = self.clock - self.window
+        while q and q[0][0] <= cutoff:
+            state[1] -= q.popleft()[1]
+
+    def push(self, key: Hashable, ts: float, value: float) -> bool:
+        """Add one event; returns False if it was dropped as too late."""
+        if ts < self.watermark:
+            self.late_dropped += 1
+            return False
+        self.clock = max(self.clock, ts)
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = [deque(), 0.0]
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+                self.keys_evicted += 1
+        else:
+            self._keys.move_to_end(key)
+        q = state[0]
+        if not q or q[-1][0] <= ts:
+            q.append((ts, value))
+        else:
+            # late but within tolerance: insert in timestamp order (near the tail)
+            i = len(q)
+            while i > 0 and q[i - 1][0] > ts:
+                i -= 1
+            q.insert(i, (ts, value))
+        state[1] += float(value)
+        self._expire(state)
+        return True
+
+    def update_many(self, events: Iterable[Tuple[Hashable, float, float]]) -> int:
+        """Batch push of (key, ts, value) events; returns how many were accepted."""
+        accepted = 0
+        for key, ts, value in events:
+            accepted += self.push(key, ts, value)
+        return accepted
+
+    def stats(self, key: Hashable) -> Optional[Dict[str, float]]:
+        """count/sum/mean for key over the current window, or None if unknown/empty."""
+        state = self._keys.get(key)
+        if state is None:
+            return None
+        self._expire(state)
+        n = len(state[0])
+        if n == 0:
+            return None
+        return {"count": float(n), "sum": state[1], "mean": state[1] / n}
+
+    def snapshot(self) -> Dict[Hashable, float]:
+        """Current windowed mean for every tracked key that still has events."""
+        out: Dict[Hashable, float] = {}
+        for key in list(self._keys):
+            st = self.stats(key)
+            if st is not None:
+                out[key] = st["mean"]
+        return out
+
+
 if __name__ == "__main__":
     # 1) sliding window max
     assert sliding_window_max([1, 3, -1, -3, 5, 3, 6, 7], 3) == [3, 3, 5, 5, 6, 7]
@@ -84,4 +430,43 @@ if __name__ == "__main__":
     # counts: 2->4, 3->3, 1->2
     assert tk[0][0] == 2 and tk[0][1] == 4 and tk[1][0] == 3
 
+    # 4) keyed time windows with lateness and LRU key cap
+    agg = TimeWindowAggregator(window=300.0, allowed_lateness=30.0, max_keys=2)
+    agg.update_many([("a", 0.0, 1.0), ("a", 100.0, 3.0), ("b", 120.0, 10.0), ("a", 90.0, 2.0)])
+    assert agg.stats("a") == {"count": 3.0, "sum": 6.0, "mean": 2.0}
+    assert not agg.push("a", 50.0, 99.0) and agg.late_dropped == 1  # behind watermark 90
+    agg.push("a", 350.0, 4.0)  # clock 350: ts 0 leaves the 5-minute window
+    assert agg.stats("a") == {"count": 3.0, "sum": 9.0, "mean": 3.0}
+    agg.push("c", 351.0, 1.0)  # third key evicts least recently updated "b"
+    assert agg.stats("b") is None and agg.keys_evicted == 1
+
+    # 5) approximate heavy hitters: bounds hold and shards merge
+    stream = [i % 7 for i in range(200)] + [42] * 300 + list(range(1000, 1400))
+    truth = Counter(stream)
+    approx = top_k_heavy_hitters(stream, 3, capacity=20)
+    assert approx[0][0] == 42 == top_k_heavy_hitters(stream, 1, exact=True)[0][0]
+    for v, est, err in approx:
+        assert est - err <= truth[v] <= est
+    left, right = SpaceSaving(20), SpaceSaving(20)
+    left.update_many(stream[::2])
+    right.update_many(stream[1::2])
+    merged = left.merge(right)
+    assert merged.n == len(stream) and merged.top_k(1)[0][0] == 42
+    for v, est, err in merged.top_k(5):
+        assert est - err <= truth[v] <= est
+
+    # 6) sharded exact counting over a file and an iterable
+    import tempfile
+    words = ["err", "ok", "ok", "warn", "ok", "err"] * 50
+    with tempfile.TemporaryDirectory() as tmp:
+        log = os.path.join(tmp, "log.txt")
+        with open(log, "w") as f:
+            for i in range(0, len(words), 3):
+                f.write(" ".join(words[i:i + 3]) + "\n")
+        top, timings = sharded_most_common(log, 2, workers=2, block_size=16)
+        assert top == Counter(words).most_common(2)
+        assert set(timings) >= {"read_s", "count_s", "merge_s"}
+    top, _ = sharded_most_common(iter(words), 2, workers=2, chunk_items=7)
+    assert top == Counter(words).most_common(2)
+
     print("Collections exercises: PASS")
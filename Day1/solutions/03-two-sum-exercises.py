@@ -5,13 +5,54 @@ Includes commented solutions for:
 1) All index pairs for target sum
 2) Unique value pairs for target sum
 3) Three Sum (unique triplets)
+
+two_sum_all_pairs and three_sum accept parallel=True / workers=N to spread the
+work over a ProcessPoolExecutor. The sorted array is placed in shared memory
+(multiprocessing.shared_memory) so workers read it without pickling, and
+per-worker results are merged in a fixed order so the output equals the
+serial version exactly. Values must fit in a signed 64-bit int.
 """
 
 from __future__ import annotations
-from typing import List, Tuple, Iterable
+from typing import List, Optional, Tuple, Iterable
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import heapq
+import math
+import os
+
+
+def _to_shared(values: array) -> shared_memory.SharedMemory:
+    """Copy an array('q') into a new shared memory block (caller unlinks)."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(values) * values.itemsize))
+    shm.buf[: len(values) * values.itemsize] = values.tobytes()
+    return shm
+
 
+@contextmanager
+def _attach_shared(name: str, length: int):
+    """Attach to a shared block by name and expose it as a zero-copy int64 view."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast("q")[:length]
+    try:
+        yield view
+    finally:
+        view.release()
+        shm.close()
 
-def two_sum_all_pairs(nums: List[int], target: int) -> List[Tuple[int, int]]:
+
+def _even_work_bounds(n: int, blocks: int) -> List[int]:
+    """Split range(n) for a triangular workload (cost of i ~ n - i) into blocks
+    of roughly equal cost: boundary k sits at n * (1 - sqrt(1 - k / blocks))."""
+    return sorted({int(n * (1.0 - math.sqrt(1.0 - k / blocks))) for k in range(blocks)} | {n})
+
+
+def two_sum_all_pairs(
+    nums: List[int], target: int, parallel: bool = False, workers: Optional[int] = None
+) -> List[Tuple[int, int]]:
     """Return all unique index pairs (i<j) where nums[i]+nums[j]==target.
 
     Approach:
@@ -20,7 +61,12 @@ def two_sum_all_pairs(nums: List[int], target: int) -> List[Tuple[int, int]]:
       - v<c: cross product of indices[v] and indices[c]
       - v==c: all index combinations within indices[v]
     - Deduplicate and sort pairs lexicographically.
+
+    parallel=True: see _two_sum_all_pairs_parallel.
     """
+    if parallel or workers is not None:
+        return _two_sum_all_pairs_parallel(nums, target, workers)
+
     from collections import defaultdict
 
     idxs = defaultdict(list)
@@ -54,6 +100,65 @@ def two_sum_all_pairs(nums: List[int], target: int) -> List[Tuple[int, int]]:
     return sorted(pairs)
 
 
+def _all_pairs_block(name: str, n: int, target: int, start: int, stop: int) -> List[Tuple[int, int]]:
+    """Worker: pairs for the value runs starting in sorted positions [start, stop).
+
+    Shared layout: vals[0:n] sorted values, vals[n:2n] their original indices
+    (stable order, so ascending within each run).
+    """
+    out: List[Tuple[int, int]] = []
+    with _attach_shared(name, 2 * n) as view:
+        vals = view[:n]
+        pos = start
+        while pos < stop:
+            v = vals[pos]
+            run_end = bisect_right(vals, v, pos, n)
+            c = target - v
+            if v < c:
+                c_lo = bisect_left(vals, c, run_end, n)
+                c_hi = bisect_right(vals, c, c_lo, n)
+                for p in range(pos, run_end):
+                    i = view[n + p]
+                    for q in range(c_lo, c_hi):
+                        j = view[n + q]
+                        out.append((i, j) if i < j else (j, i))
+            elif v == c:
+                for a in range(pos, run_end):
+                    for b in range(a + 1, run_end):
+                        out.append((view[n + a], view[n + b]))
+            pos = run_end
+        vals.release()
+    out.sort()
+    return out
+
+
+def _two_sum_all_pairs_parallel(nums: List[int], target: int, workers: Optional[int]) -> List[Tuple[int, int]]:
+    """Split the distinct values (runs of the sorted array) across processes.
+
+    Each distinct v is owned by exactly one block (pairs are emitted from the
+    smaller value of v/c), so worker outputs are disjoint; each is sorted and
+    heapq.merge yields the same lexicographic order as the serial version.
+    """
+    n = len(nums)
+    if n < 2:
+        return []
+    workers = workers or os.cpu_count() or 1
+    order = sorted(range(n), key=nums.__getitem__)
+    sorted_vals = [nums[i] for i in order]
+    shm = _to_shared(array("q", sorted_vals + order))
+    try:
+        # block boundaries snapped to run starts so a value is never split
+        blocks = workers * 4
+        bounds = sorted({bisect_left(sorted_vals, sorted_vals[n * k // blocks]) for k in range(blocks)} | {n})
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_all_pairs_block, shm.name, n, target, a, b) for a, b in zip(bounds, bounds[1:])]
+            parts = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    return list(heapq.merge(*parts))
+
+
 def two_sum_unique_value_pairs(nums: Iterable[int], target: int) -> List[Tuple[int, int]]:
     """Return unique value pairs (x,y) with x<=y and x+y==target, sorted by value.
 
@@ -85,18 +190,31 @@ def two_sum_unique_value_pairs(nums: Iterable[int], target: int) -> List[Tuple[i
     return out
 
 
-def three_sum(nums: List[int], target: int = 0) -> List[Tuple[int, int, int]]:
+def three_sum(
+    nums: List[int], target: int = 0, parallel: bool = False, workers: Optional[int] = None
+) -> List[Tuple[int, int, int]]:
     """Return unique triplets (a,b,c) such that a+b+c==target.
 
     Classic solution:
     - Sort nums and iterate i; for each i, do two-pointer on the rest.
     - Skip duplicates for i and within two-pointer to ensure uniqueness.
     - O(n^2) time, O(1) extra (ignoring output).
+
+    parallel=True: the outer i loop is split into contiguous blocks of roughly
+    equal two-pointer work; blocks run in a process pool over the shared sorted
+    array and are concatenated in i order, matching the serial output.
     """
     nums = sorted(nums)
+    if parallel or workers is not None:
+        return _three_sum_parallel(nums, target, workers)
+    return _three_sum_range(nums, target, 0, len(nums))
+
+
+def _three_sum_range(nums, target: int, start: int, stop: int) -> List[Tuple[int, int, int]]:
+    """Serial three-sum restricted to outer indices i in [start, stop) of sorted nums."""
     n = len(nums)
     res: List[Tuple[int, int, int]] = []
-    for i in range(n):
+    for i in range(start, stop):
         if i > 0 and nums[i] == nums[i - 1]:
             continue
         lo, hi = i + 1, n - 1
@@ -117,6 +235,28 @@ def three_sum(nums: List[int], target: int = 0) -> List[Tuple[int, int, int]]:
     return res
 
 
+def _three_sum_block(name: str, n: int, target: int, start: int, stop: int) -> List[Tuple[int, int, int]]:
+    with _attach_shared(name, n) as view:
+        return _three_sum_range(view, target, start, stop)
+
+
+def _three_sum_parallel(nums: List[int], target: int, workers: Optional[int]) -> List[Tuple[int, int, int]]:
+    n = len(nums)
+    if n < 3:
+        return []
+    workers = workers or os.cpu_count() or 1
+    shm = _to_shared(array("q", nums))
+    try:
+        bounds = _even_work_bounds(n, workers * 4)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_three_sum_block, shm.name, n, target, a, b) for a, b in zip(bounds, bounds[1:])]
+            parts = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    return [t for part in parts for t in part]
+
+
 if __name__ == "__main__":
     # 1) all index pairs
     nums = [1, 3, 2, 2, 4, 0, 3]
@@ -131,4 +271,9 @@ if __name__ == "__main__":
     triples = three_sum([-1, 0, 1, 2, -1, -4], 0)
     assert set(triples) == {(-1, -1, 2), (-1, 0, 1)}
 
+    # 4) parallel modes match the serial output exactly
+    assert two_sum_all_pairs(nums, 4, parallel=True, workers=2) == pairs
+    big = [(i * 7919) % 41 - 20 for i in range(300)]
+    assert three_sum(big, 0, parallel=True, workers=2) == three_sum(big, 0)
+
     print("Two Sum exercises: PASS")
@@ -2,7 +2,7 @@
 Solutions: ML memory exercises (optional dependencies: pandas, numpy, scipy)
 
 Includes commented solutions for:
-1) Downcasting report (pandas)
+1) Downcasting report, per column (pandas)
 2) Chunked CSV sum (pandas)
 3) Sparse vs dense experiment (numpy/scipy)
 
@@ -12,31 +12,58 @@ required package is missing. The __main__ section tries small demos if available
 
 
 from __future__ import annotations
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+import importlib.util
+import os
+import sys
 
-def downcasting_report(df) -> Dict[str, float]:
-    """Return memory before/after downcasting and savings.
+
+def _ml_memory():
+    """Load ../04-ml-memory.py (its file name is not a valid module name)."""
+    name = "04_ml_memory"
+    if name not in sys.modules:
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "04-ml-memory.py")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def downcasting_report(df, category_max_ratio: float = 0.5, sparse_min_fill: float = 0.9) -> Dict[str, Any]:
+    """Return memory before/after downcasting, per column and in total.
 
     Steps:
-    - Measure memory with df.memory_usage(deep=True).sum()
-    - Downcast numeric columns using pandas.to_numeric
-    - Measure again and compute savings
+    - Infer target dtypes with infer_dtype_schema from 04-ml-memory (ints and
+      floats downcast, integral floats with NaN -> Int8/16/32, mostly-zero /
+      mostly-NaN columns -> SparseDtype, low-cardinality strings -> category)
+    - Convert column by column instead of df.copy(): peak memory is df + one column
+    - Measure each column with Series.memory_usage(deep=True, index=False)
+    - Totals are the per-column sums (the index is not counted)
     """
     try:
-        import pandas as pd  # type: ignore
+        import pandas as pd  # type: ignore  # noqa: F401
     except Exception as e:
         raise ImportError("pandas required for downcasting_report") from e
 
-    before = float(df.memory_usage(deep=True).sum())
-    df2 = df.copy()
-    for col in df2.select_dtypes(include=["int", "int64", "int32"]).columns:
-        df2[col] = pd.to_numeric(df2[col], downcast="integer")
-    for col in df2.select_dtypes(include=["float"]).columns:
-        df2[col] = pd.to_numeric(df2[col], downcast="float")
-    after = float(df2.memory_usage(deep=True).sum())
+    ml = _ml_memory()
+    schema = ml.infer_dtype_schema(df, category_max_ratio, sparse_min_fill)
+    columns: Dict[str, Dict[str, Any]] = {}
+    for col in df.columns:
+        s = df[col]
+        small = ml.apply_dtype_schema(df[[col]], {col: schema[col]})[col] if col in schema else s
+        columns[col] = {
+            "dtype_before": str(s.dtype),
+            "dtype_after": str(small.dtype),
+            "before_bytes": float(s.memory_usage(deep=True, index=False)),
+            "after_bytes": float(small.memory_usage(deep=True, index=False)),
+        }
+        del small
+    before = sum(c["before_bytes"] for c in columns.values())
+    after = sum(c["after_bytes"] for c in columns.values())
     savings = before - after
     pct = (savings / before * 100.0) if before else 0.0
-    return {"before_bytes": before, "after_bytes": after, "savings_bytes": savings, "savings_pct": pct}
+    return {"before_bytes": before, "after_bytes": after, "savings_bytes": savings, "savings_pct": pct, "columns": columns}
 
 
 def chunked_csv_sum(path: str, column: str, chunksize: int = 100_000) -> float:
@@ -104,10 +131,19 @@ if __name__ == "__main__":
     # Lightweight self-checks if deps exist
     try:
         import pandas as pd  # type: ignore
-        df = pd.DataFrame({"a": [1, 2, 3], "b": [1.0, 2.0, 3.0]})
+        df = pd.DataFrame({
+            "a": [1, 2, 3] * 100,
+            "b": [1.0, 2.0, 3.0] * 100,
+            "c": ["red", "green", "blue"] * 100,
+            "d": [1.0, None, 3.0] * 100,
+            "e": [0.0, 0.0, 0.0] * 99 + [1.5, 0.0, 0.0],
+        })
         rep = downcasting_report(df)
         assert rep["after_bytes"] <= rep["before_bytes"]
-        print("Downcasting report:", rep)
+        assert rep["columns"]["d"]["dtype_after"] == "Int8" and rep["columns"]["c"]["dtype_after"] == "category"
+        print("Downcasting report:", {k: v for k, v in rep.items() if k != "columns"})
+        for col, row in rep["columns"].items():
+            print(f"  {col}: {row['dtype_before']:>8s} -> {row['dtype_after']:<22s} {row['before_bytes']:8.0f} -> {row['after_bytes']:8.0f} bytes")
     except Exception as e:
         print("(skip) pandas not available:", e)
 